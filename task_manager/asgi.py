@@ -1,7 +1,13 @@
 import os
 
+from django.conf import settings
 from django.core.asgi import get_asgi_application
 
+from task_manager.templating import warm_templates
+
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'task_manager.settings')
 
 application = get_asgi_application()
+
+if settings.TEMPLATE_WARMUP:
+    warm_templates()
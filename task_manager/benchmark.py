@@ -0,0 +1,112 @@
+import statistics
+import time
+import tracemalloc
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.urls import URLPattern, URLResolver, get_resolver, reverse
+
+from task_manager.performance import RequestStats
+from task_manager.tasks.models import Task
+
+SKIPPED_NAMESPACES = {'admin'}
+SKIPPED_URLS = {'logout', 'metrics'}
+
+
+def iter_url_names(patterns, namespace=None):
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            if pattern.namespace not in SKIPPED_NAMESPACES:
+                yield from iter_url_names(pattern.url_patterns, pattern.namespace)
+        elif isinstance(pattern, URLPattern) and pattern.name:
+            yield pattern, f'{namespace}:{pattern.name}' if namespace else pattern.name
+
+
+def get_object(model, user):
+    if model is get_user_model():
+        return user
+    if model is Task:
+        return Task.objects.filter(creator=user).order_by('pk').first()
+    return model.objects.order_by('pk').first()
+
+
+def get_cases(user, extra_cases=()):
+    cases = []
+    for pattern, name in iter_url_names(get_resolver().url_patterns):
+        view_class = getattr(pattern.callback, 'view_class', None)
+        if name in SKIPPED_URLS or \
+                'get' not in getattr(view_class, 'http_method_names', ['get']):
+            continue
+        kwargs = {}
+        if 'pk' in pattern.pattern.converters:
+            kwargs['pk'] = get_object(view_class.model, user).pk
+        cases.append((name, reverse(name, kwargs=kwargs)))
+    return cases + list(extra_cases)
+
+
+def request(client, url):
+    stats = RequestStats()
+    with connection.execute_wrapper(stats):
+        response = client.get(url)
+        if response.streaming:
+            size = sum(len(chunk) for chunk in response.streaming_content)
+        else:
+            size = len(response.content)
+    return response.status_code, stats.queries, size
+
+
+def measure(client, url, repeat):
+    # The first request compiles templates unless they were warmed up,
+    # the others are measured with an empty cache.
+    start = time.perf_counter()
+    request(client, url)
+    first = (time.perf_counter() - start) * 1000
+    cache.clear()
+    tracemalloc.start()
+    try:
+        status, queries, size = request(client, url)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    durations, cpu_times = [], []
+    for _i in range(repeat):
+        start, cpu_start = time.perf_counter(), time.process_time()
+        request(client, url)
+        durations.append((time.perf_counter() - start) * 1000)
+        cpu_times.append((time.process_time() - cpu_start) * 1000)
+    return {
+        'url': url,
+        'status': status,
+        'queries': queries,
+        'bytes': size,
+        'first_ms': round(first, 2),
+        'p50_ms': round(statistics.median(durations), 2),
+        'p95_ms': round(statistics.quantiles(durations, n=20,
+                                             method='inclusive')[18], 2),
+        'cpu_ms': round(statistics.median(cpu_times), 2),
+        'peak_kib': round(peak / 1024, 1),
+    }
+
+
+def get_regressions(results, baseline, tolerance, min_delta_ms=10,
+                    min_delta_kib=128):
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        if result['queries'] > base['queries']:
+            regressions.append(
+                f'{name}: {result["queries"]} queries, baseline {base["queries"]}'
+            )
+        if result['p95_ms'] > base['p95_ms'] * (1 + tolerance) + min_delta_ms:
+            regressions.append(
+                f'{name}: p95 {result["p95_ms"]} ms, baseline {base["p95_ms"]} ms'
+            )
+        if result['peak_kib'] > base['peak_kib'] * (1 + tolerance) + min_delta_kib:
+            regressions.append(
+                f'{name}: peak {result["peak_kib"]} KiB, baseline {base["peak_kib"]} KiB'
+            )
+    return regressions
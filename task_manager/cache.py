@@ -0,0 +1,110 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.forms.models import ModelChoiceIterator
+from django.template.loader import render_to_string
+from django.utils.safestring import mark_safe
+
+from task_manager.replicas import use_replica
+
+CHOICES_TIMEOUT = 60 * 60 * 24
+FRAGMENT_TIMEOUT = 60 * 60 * 24
+
+
+def get_version_key(model):
+    return f'version:{model._meta.label_lower}'
+
+
+def new_version():
+    return time.time_ns()
+
+
+def get_versions(*models):
+    keys = [get_version_key(model) for model in models]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            cache.add(key, new_version(), None)
+            versions[key] = cache.get(key)
+    return [versions[key] for key in keys]
+
+
+def get_version(model):
+    return get_versions(model)[0]
+
+
+def bump_version(model):
+    # Versions are timestamps, so they also tell when a model last changed.
+    key = get_version_key(model)
+    cache.set(key, max(new_version(), (cache.get(key) or 0) + 1), None)
+
+
+def get_timeout(timeout):
+    # A lagging replica can return data older than the versions it is cached
+    # under, so such entries only live as long as the lag may last.
+    if use_replica.get():
+        return min(timeout, settings.REPLICA_PIN_SECONDS)
+    return timeout
+
+
+def track_versions(model, ignored_fields=()):
+    # Bump right away and once more after commit, so a concurrent request
+    # cannot cache data of the uncommitted transaction under the new version.
+    def on_change(sender, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        if update_fields and set(update_fields) <= set(ignored_fields):
+            return
+        bump_version(sender)
+        transaction.on_commit(lambda: bump_version(sender))
+
+    uid = f'track_versions:{model._meta.label_lower}'
+    post_save.connect(on_change, sender=model, weak=False, dispatch_uid=uid)
+    post_delete.connect(on_change, sender=model, weak=False, dispatch_uid=uid)
+
+
+def get_cached_choices(queryset, label_from_instance):
+    def get_choices():
+        return [(obj.pk, label_from_instance(obj)) for obj in queryset.iterator()]
+
+    if not settings.VERSIONED_CACHE:
+        return get_choices()
+    query_hash = hashlib.md5(str(queryset.query).encode()).hexdigest()
+    key = 'choices:{}:{}:{}'.format(
+        queryset.model._meta.label_lower, get_version(queryset.model), query_hash
+    )
+    return cache.get_or_set(key, get_choices, get_timeout(CHOICES_TIMEOUT))
+
+
+def render_cached_fragments(template_name, objects, get_key, context_name):
+    # Keys are built from the rendered values, not from versions, so any
+    # cache can hold the fragments.
+    keys = {get_key(obj): obj for obj in objects}
+    fragments = cache.get_many(keys)
+    missing = {
+        key: render_to_string(template_name, {context_name: obj})
+        for key, obj in keys.items() if key not in fragments
+    }
+    if missing:
+        cache.set_many(missing, FRAGMENT_TIMEOUT)
+        fragments.update(missing)
+    return [mark_safe(fragments[key]) for key in keys]
+
+
+class CachedModelChoiceIterator(ModelChoiceIterator):
+    def __iter__(self):
+        if self.field.empty_label is not None:
+            yield ('', self.field.empty_label)
+        yield from self.get_choices()
+
+    def __len__(self):
+        return len(self.get_choices()) + (self.field.empty_label is not None)
+
+    def __bool__(self):
+        return self.field.empty_label is not None or bool(self.get_choices())
+
+    def get_choices(self):
+        return get_cached_choices(self.queryset, self.field.label_from_instance)
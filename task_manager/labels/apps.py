@@ -1,8 +1,13 @@
 from django.apps import AppConfig
 from django.utils.translation import gettext_lazy as _
 
+from task_manager.cache import track_versions
+
 
 class LabelsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'task_manager.labels'
     verbose_name = _('Labels')
+
+    def ready(self):
+        track_versions(self.get_model('Label'))
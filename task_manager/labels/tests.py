@@ -1,12 +1,12 @@
 from django.conf import settings
 from django.core.exceptions import ObjectDoesNotExist
 from django.shortcuts import reverse
-from django.test import TestCase
+from django.test import TestCase, override_settings
 
 from task_manager.labels.models import Label
 from task_manager.statuses.models import Status
 from task_manager.tasks.models import Task
-from task_manager.tests import SetUpLoggedUserMixin
+from task_manager.tests import SetUpLoggedUserMixin, ConditionalGetTestMixin
 
 
 class TestLabelListView(SetUpLoggedUserMixin, TestCase):
@@ -25,6 +25,32 @@ class TestLabelListView(SetUpLoggedUserMixin, TestCase):
         self.assertRedirects(response, settings.LOGIN_URL)
 
 
+@override_settings(VERSIONED_CACHE=True)
+class TestLabelListViewConditionalGet(SetUpLoggedUserMixin,
+                                      ConditionalGetTestMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.url = reverse('labels_list')
+        cls.test_label = Label.objects.create(name='Test label')
+
+    def test_label_list_view_not_modified(self):
+        etag = self.get_etag(self.url)
+        self.assertNotModified(self.url, etag)
+
+        self.test_label.name = 'Renamed label'
+        self.test_label.save()
+        self.assertModified(self.url, etag)
+
+    def test_label_list_view_modified_by_tasks(self):
+        etag = self.get_etag(self.url)
+        task = Task.objects.create(name='Test task',
+                                   status=Status.objects.create(name='Task status'),
+                                   creator=self.logged_user)
+        task.labels.set(Label.objects.all())
+        self.assertModified(self.url, etag)
+
+
 class TestLabelCreateView(SetUpLoggedUserMixin, TestCase):
     @classmethod
     def setUpTestData(cls):
@@ -1,19 +1,30 @@
 from django.contrib import messages
 from django.contrib.messages.views import SuccessMessageMixin
+from django.db.models import Count, Max
 from django.shortcuts import redirect
 from django.urls import reverse_lazy
 from django.utils.translation import gettext as _
 from django.views.generic import ListView, CreateView, UpdateView, DeleteView
 
+from task_manager.cache import get_version
 from task_manager.labels.models import Label
-from task_manager.mixins import CustomLoginRequiredMixin
+from task_manager.mixins import CustomLoginRequiredMixin, ConditionalGetMixin, \
+    AsyncViewMixin, ReplicaReadMixin
+from task_manager.tasks.models import Task
 
 
-class LabelListView(CustomLoginRequiredMixin, ListView):
+class LabelListView(AsyncViewMixin, ReplicaReadMixin, CustomLoginRequiredMixin,
+                    ConditionalGetMixin, ListView):
     model = Label
     template_name = 'labels/list.html'
     context_object_name = 'labels'
 
+    def get_etag_parts(self):
+        return [
+            *Label.objects.aggregate(Max('updated'), Count('id')).values(),
+            get_version(Task),
+        ]
+
 
 class LabelCreateView(CustomLoginRequiredMixin, SuccessMessageMixin, CreateView):
     model = Label
@@ -1,11 +1,144 @@
+import hashlib
+from functools import update_wrapper
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth.mixins import LoginRequiredMixin
+from django.core.cache import cache
+from django.db import close_old_connections
 from django.shortcuts import redirect
 from django.urls import reverse
-from django.utils.translation import gettext as _
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.decorators import classonlymethod
+from django.utils.translation import get_language, gettext as _
+
+from task_manager.cache import get_timeout, get_versions
+from task_manager.performance import render_response
+from task_manager.replicas import PIN_COOKIE, has_replica, reading_from_replica, \
+    use_replica
 
 
 class CustomLoginRequiredMixin(LoginRequiredMixin):
     def handle_no_permission(self):
         messages.error(self.request, _('You are not logged in! Please log in.'))
         return redirect(reverse('login'))
+
+
+class AnonymousCachePageMixin:
+    page_cache_timeout = 60
+    page_cache_models = ()
+    page_cache_params = ()
+
+    def is_page_cacheable(self):
+        request = self.request
+        if not settings.VERSIONED_CACHE or request.method not in ('GET', 'HEAD') \
+                or request.user.is_authenticated:
+            return False
+        return not messages.get_messages(request)
+
+    def get_page_cache_key(self):
+        # Only the parameters the view reads, so junk in the query string
+        # cannot fill the cache with copies of one page.
+        request = self.request
+        params = [(name, request.GET.getlist(name))
+                  for name in sorted(self.page_cache_params) if name in request.GET]
+        versions = get_versions(*self.page_cache_models)
+        key = f'{request.path}:{params}:{get_language()}:{versions}'
+        return f'page:{hashlib.md5(key.encode()).hexdigest()}'
+
+    def dispatch(self, request, *args, **kwargs):
+        self.request = request
+        if not self.is_page_cacheable():
+            return super().dispatch(request, *args, **kwargs)
+
+        key = self.get_page_cache_key()
+        response = cache.get(key)
+        if response is not None:
+            return response
+
+        response = super().dispatch(request, *args, **kwargs)
+        if hasattr(response, 'render'):
+            response.render()
+        # Like UpdateCacheMiddleware, the whole response is kept with its
+        # headers, but never one that sets cookies.
+        if response.status_code == 200 and not response.cookies:
+            cache.set(key, response, get_timeout(self.page_cache_timeout))
+        return response
+
+
+class ReplicaReadMixin:
+    def can_read_from_replica(self):
+        request = self.request
+        return has_replica() and request.method in ('GET', 'HEAD') \
+            and PIN_COOKIE not in request.COOKIES
+
+    def dispatch(self, request, *args, **kwargs):
+        self.request = request
+        if not self.can_read_from_replica():
+            return super().dispatch(request, *args, **kwargs)
+        with reading_from_replica():
+            response = super().dispatch(request, *args, **kwargs)
+            if callable(getattr(response, 'render', None)):
+                render_response(response)
+            return response
+
+
+class ConditionalGetMixin:
+    def get_etag_parts(self):
+        return []
+
+    def get_etag(self):
+        request = self.request
+        parts = [
+            request.get_full_path(),
+            get_language(),
+            request.user.pk,
+            request.META.get('CSRF_COOKIE'),
+            *self.get_etag_parts(),
+        ]
+        return '"{}"'.format(hashlib.md5(repr(parts).encode()).hexdigest())
+
+    def dispatch(self, request, *args, **kwargs):
+        # A lagging replica would pin its stale page to an ETag of fresh versions.
+        if not settings.VERSIONED_CACHE or request.method not in ('GET', 'HEAD') \
+                or use_replica.get() or messages.get_messages(request):
+            return super().dispatch(request, *args, **kwargs)
+
+        etag = self.get_etag()
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = super().dispatch(request, *args, **kwargs)
+        if response.status_code in (200, 304):
+            response.headers.setdefault('ETag', etag)
+            patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+
+def run_view_in_thread(view, request, *args, **kwargs):
+    close_old_connections()
+    try:
+        response = view(request, *args, **kwargs)
+        if callable(getattr(response, 'render', None)):
+            render_response(response)
+        return response
+    finally:
+        close_old_connections()
+
+
+class AsyncViewMixin:
+    # Django's async ORM sends every query through one shared thread, so with
+    # ASYNC_VIEWS the sync view runs and renders on the thread pool instead,
+    # each thread keeping its own database connection.
+    @classonlymethod
+    def as_view(cls, **initkwargs):
+        view = super().as_view(**initkwargs)
+        if not settings.ASYNC_VIEWS:
+            return view
+
+        async def async_view(request, *args, **kwargs):
+            return await sync_to_async(run_view_in_thread, thread_sensitive=False)(
+                view, request, *args, **kwargs
+            )
+
+        return update_wrapper(async_view, view)
@@ -0,0 +1,170 @@
+import base64
+import binascii
+import json
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import F, Field, Func, Q, Value
+from django.db.models.lookups import GreaterThan, LessThan
+from django.http import Http404
+from django.utils.translation import gettext as _
+
+
+class InvalidCursor(Exception):
+    pass
+
+
+class KeysetPage:
+    def __init__(self, object_list, next_cursor=None, previous_cursor=None,
+                 is_first=True):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+        self.is_first = is_first
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous() or not self.is_first
+
+
+class KeysetPaginator:
+    def __init__(self, queryset, per_page, ordering):
+        self.queryset = queryset
+        self.per_page = per_page
+        self.ordering = [
+            (field.lstrip('-'), field.startswith('-')) for field in ordering
+        ]
+
+    def page(self, cursor=None):
+        values, backwards = self.decode_cursor(cursor) if cursor else (None, False)
+        queryset = self.queryset.order_by(*self.get_order_by(backwards))
+        if values is not None:
+            queryset = queryset.filter(self.get_keyset_filter(values, backwards))
+
+        rows = list(queryset[:self.per_page + 1])
+        has_more = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+        if not rows:
+            return KeysetPage(rows, is_first=values is None)
+        if backwards:
+            rows.reverse()
+
+        has_next, has_previous = (True, has_more) if backwards \
+            else (has_more, values is not None)
+        return KeysetPage(
+            rows,
+            next_cursor=self.encode_cursor(rows[-1]) if has_next else None,
+            previous_cursor=self.encode_cursor(rows[0], backwards=True)
+            if has_previous else None,
+            is_first=not has_previous,
+        )
+
+    def get_order_by(self, backwards=False):
+        return [
+            f'-{name}' if descending != backwards else name
+            for name, descending in self.ordering
+        ]
+
+    def get_keyset_filter(self, values, backwards=False):
+        lookups = [
+            'lt' if descending != backwards else 'gt'
+            for _name, descending in self.ordering
+        ]
+        if len(set(lookups)) == 1:
+            return self.get_row_filter(lookups[0], values)
+
+        # Mixed directions cannot be a row comparison, the bound on the first
+        # column still lets the database seek the index.
+        first = self.ordering[0][0]
+        bound = Q(**{f'{first}__{lookups[0]}e': values[0]})
+        keyset_filter = Q()
+        equal = Q()
+        for (name, _descending), lookup, value in zip(self.ordering, lookups, values):
+            keyset_filter |= equal & Q(**{f'{name}__{lookup}': value})
+            equal &= Q(**{name: value})
+        return bound & keyset_filter
+
+    def get_row_filter(self, lookup, values):
+        # (created, id) > (%s, %s) is one index range, unlike the OR form.
+        names = [name for name, _descending in self.ordering]
+        return (GreaterThan if lookup == 'gt' else LessThan)(
+            Func(*map(F, names), function='', output_field=Field()),
+            Func(
+                *(Value(value, output_field=self.get_field(name))
+                  for name, value in zip(names, values)),
+                function='', output_field=Field(),
+            ),
+        )
+
+    def get_value(self, row, name):
+        if isinstance(row, dict):
+            return row[name]
+        return getattr(row, name)
+
+    def encode_cursor(self, row, backwards=False):
+        values = []
+        for name, _descending in self.ordering:
+            value = self.get_value(row, name)
+            values.append(value.isoformat() if hasattr(value, 'isoformat') else value)
+        payload = json.dumps({'v': values, 'b': backwards}).encode()
+        return base64.urlsafe_b64encode(payload).decode()
+
+    def decode_cursor(self, cursor):
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            values = [
+                self.to_python(name, value)
+                for (name, _descending), value in zip(self.ordering, payload['v'])
+            ]
+            backwards = bool(payload.get('b'))
+        except (binascii.Error, ValueError, TypeError, KeyError, ValidationError):
+            raise InvalidCursor(cursor)
+        if len(values) != len(self.ordering):
+            raise InvalidCursor(cursor)
+        return values, backwards
+
+    def get_field(self, name):
+        try:
+            return self.queryset.model._meta.get_field(name)
+        except FieldDoesNotExist:
+            return None
+
+    def to_python(self, name, value):
+        field = self.get_field(name)
+        return value if field is None else field.to_python(value)
+
+
+class KeysetPaginationMixin:
+    paginate_by = 50
+    cursor_kwarg = 'cursor'
+
+    def get_keyset_ordering(self):
+        return self.get_ordering()
+
+    def paginate_queryset(self, queryset, page_size):
+        paginator = KeysetPaginator(queryset, page_size, self.get_keyset_ordering())
+        try:
+            page = paginator.page(self.request.GET.get(self.cursor_kwarg))
+        except InvalidCursor:
+            raise Http404(_('Invalid page'))
+        page.next_query = self.get_page_query(page.next_cursor)
+        page.previous_query = self.get_page_query(page.previous_cursor)
+        page.first_query = self.get_page_query()
+        return paginator, page, page.object_list, page.has_other_pages()
+
+    def get_page_query(self, cursor=None):
+        query = self.request.GET.copy()
+        query.pop(self.cursor_kwarg, None)
+        if cursor:
+            query[self.cursor_kwarg] = cursor
+        return query.urlencode()
@@ -0,0 +1,266 @@
+import json
+import logging
+import os
+import threading
+import time
+from collections import defaultdict
+from contextvars import ContextVar
+
+import redis
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+logger = logging.getLogger(__name__)
+
+DURATION_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+
+class RequestStats:
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0
+        self.template_time = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_time += time.perf_counter() - start
+            self.queries += 1
+
+
+current_stats = ContextVar('request_stats', default=None)
+
+
+def record_query(execute, sql, params, many, context):
+    stats = current_stats.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    return stats(execute, sql, params, many, context)
+
+
+def install_query_recorder(connection, **kwargs):
+    # The wrapper stays on the connection and reads the stats of the current
+    # request from a context variable, which also reaches the threads that
+    # async views and the async ORM run queries in.
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+connection_created.connect(install_query_recorder)
+
+
+class LocalCounters:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.values = defaultdict(float)
+
+    def add(self, increments):
+        with self.lock:
+            for field, amount in increments:
+                self.values[field] += amount
+
+    def read(self):
+        with self.lock:
+            return dict(self.values)
+
+
+class RedisCounters:
+    key = 'taskmanager:metrics'
+
+    def __init__(self, url):
+        self.client = redis.Redis.from_url(url)
+
+    def add(self, increments):
+        pipeline = self.client.pipeline(transaction=False)
+        for field, amount in increments:
+            pipeline.hincrbyfloat(self.key, field, amount)
+        pipeline.execute()
+
+    def read(self):
+        return {field.decode(): float(value)
+                for field, value in self.client.hgetall(self.key).items()}
+
+
+class Metrics:
+    # Every worker process counts its own requests. With Redis the counters
+    # are summed in one hash, otherwise each series carries the pid, so it
+    # stays monotonic whichever worker answers the scrape.
+    def __init__(self, redis_url=None):
+        self.counters = RedisCounters(redis_url) if redis_url else LocalCounters()
+        self.per_process = not redis_url
+
+    def get_key(self, view, method):
+        return (str(os.getpid()), view, method) if self.per_process else (view, method)
+
+    def get_label_names(self, *names):
+        return ('pid', 'view', 'method', *names) if self.per_process \
+            else ('view', 'method', *names)
+
+    def observe(self, view, method, status, duration, stats, size, over_budget):
+        key = self.get_key(view, method)
+        increments = [
+            (encode_field('requests_total', (*key, str(status))), 1),
+            (encode_field('duration', key), duration),
+            (encode_field('queries', key), stats.queries),
+            (encode_field('db', key), stats.db_time),
+            (encode_field('template', key), stats.template_time),
+            (encode_field('bytes', key), size),
+            (encode_field('over_budget', key), over_budget),
+        ]
+        increments += [
+            (encode_field('bucket', (*key, bound)), 1)
+            for bound in DURATION_BUCKETS if duration <= bound
+        ]
+        try:
+            self.counters.add(increments)
+        except redis.RedisError:
+            logger.warning('Metrics were not recorded', exc_info=True)
+
+    def render(self):
+        samples = defaultdict(dict)
+        for field, value in self.counters.read().items():
+            name, key = json.loads(field)
+            samples[name][tuple(key)] = value
+
+        lines = []
+        self.render_counter(lines, 'requests_total', 'Handled requests',
+                            self.get_label_names('status'),
+                            samples['requests_total'].items())
+        self.render_histogram(lines, samples)
+        for name, field, help_text in [
+            ('db_queries_total', 'queries', 'Database queries'),
+            ('db_duration_seconds_total', 'db', 'Time spent in database queries'),
+            ('template_duration_seconds_total', 'template',
+             'Time spent rendering template responses'),
+            ('response_bytes_total', 'bytes', 'Size of non-streaming responses'),
+            ('query_budget_exceeded_total', 'over_budget',
+             'Requests that ran more queries than QUERY_BUDGET'),
+        ]:
+            self.render_counter(lines, name, help_text, self.get_label_names(),
+                                samples[field].items())
+        return '\n'.join(lines) + '\n'
+
+    def render_counter(self, lines, name, help_text, label_names, samples):
+        lines.append(f'# HELP taskmanager_{name} {help_text}')
+        lines.append(f'# TYPE taskmanager_{name} counter')
+        for key, value in samples:
+            lines.append(
+                f'taskmanager_{name}{format_labels(label_names, key)} {format_value(value)}'
+            )
+
+    def render_histogram(self, lines, samples):
+        name = 'taskmanager_request_duration_seconds'
+        lines.append(f'# HELP {name} Request wall time')
+        lines.append(f'# TYPE {name} histogram')
+        bucket_labels = self.get_label_names('le')
+        for key, duration in samples['duration'].items():
+            count = format_value(sum(
+                value for request_key, value in samples['requests_total'].items()
+                if request_key[:-1] == key
+            ))
+            for bound in DURATION_BUCKETS:
+                value = format_value(samples['bucket'].get((*key, bound), 0))
+                lines.append(f'{name}_bucket{format_labels(bucket_labels, (*key, bound))} {value}')
+            lines.append(f'{name}_bucket{format_labels(bucket_labels, (*key, "+Inf"))} {count}')
+            labels = format_labels(self.get_label_names(), key)
+            lines.append(f'{name}_sum{labels} {duration}')
+            lines.append(f'{name}_count{labels} {count}')
+
+
+def encode_field(name, key):
+    return json.dumps([name, key])
+
+
+def format_value(value):
+    return int(value) if float(value).is_integer() else value
+
+
+def format_labels(names, values):
+    labels = ','.join(
+        '{}="{}"'.format(name, str(value).replace('\\', '\\\\')
+                         .replace('"', '\\"').replace('\n', '\\n'))
+        for name, value in zip(names, values)
+    )
+    return f'{{{labels}}}'
+
+
+metrics = Metrics(settings.METRICS_REDIS_URL)
+
+
+class PerformanceMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        stats, token, start = self.start(request)
+        try:
+            response = self.get_response(request)
+        finally:
+            current_stats.reset(token)
+        return self.finish(request, response, stats, time.perf_counter() - start)
+
+    async def __acall__(self, request):
+        stats, token, start = self.start(request)
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_stats.reset(token)
+        return self.finish(request, response, stats, time.perf_counter() - start)
+
+    def start(self, request):
+        for connection in connections.all(initialized_only=True):
+            install_query_recorder(connection)
+        stats = request.performance_stats = RequestStats()
+        return stats, current_stats.set(stats), time.perf_counter()
+
+    def finish(self, request, response, stats, duration):
+        view = getattr(request.resolver_match, 'view_name', None) or 'unresolved'
+        over_budget = stats.queries > settings.QUERY_BUDGET
+        if over_budget:
+            logger.warning(
+                'Query budget exceeded: %s ran %d queries (budget %d) for %s',
+                view, stats.queries, settings.QUERY_BUDGET, request.path,
+            )
+        size = 0 if response.streaming else len(response.content)
+        metrics.observe(view, request.method, response.status_code,
+                        duration, stats, size, over_budget)
+        if settings.SERVER_TIMING:
+            response.headers['Server-Timing'] = get_server_timing(duration, stats)
+        return response
+
+    def process_template_response(self, request, response):
+        start = time.perf_counter()
+
+        def record_render_time(response):
+            request.performance_stats.template_time += time.perf_counter() - start
+
+        response.add_post_render_callback(record_render_time)
+        return response
+
+
+def render_response(response):
+    start = time.perf_counter()
+    response.render()
+    stats = current_stats.get()
+    if stats is not None:
+        stats.template_time += time.perf_counter() - start
+
+
+def get_server_timing(duration, stats):
+    return ', '.join([
+        f'app;dur={duration * 1000:.1f}',
+        f'db;dur={stats.db_time * 1000:.1f};desc="{stats.queries} queries"',
+        f'tpl;dur={stats.template_time * 1000:.1f}',
+    ])
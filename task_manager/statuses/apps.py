@@ -1,8 +1,13 @@
 from django.apps import AppConfig
 from django.utils.translation import gettext_lazy as _
 
+from task_manager.cache import track_versions
+
 
 class StatusesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'task_manager.statuses'
     verbose_name = _('Statuses')
+
+    def ready(self):
+        track_versions(self.get_model('Status'))
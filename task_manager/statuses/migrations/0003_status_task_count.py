@@ -0,0 +1,30 @@
+# Generated by Django 5.0.14 on 2026-10-18 01:34
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def count_tasks(apps, schema_editor):
+    links = apps.get_model('tasks', 'Task').objects
+    apps.get_model('statuses', 'Status').objects.update(task_count=Coalesce(Subquery(
+        links.filter(status=OuterRef('pk')).order_by()
+        .values('status').annotate(count=Count('pk')).values('count')
+    ), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0004_task_filter_indexes'),
+        ('statuses', '0002_alter_status_options_remove_status_created_at_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='status',
+            name='task_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='tasks'),
+        ),
+        migrations.RunPython(count_tasks, migrations.RunPython.noop),
+    ]
@@ -1,8 +1,13 @@
+from django.db import models
 from django.utils.translation import gettext_lazy as _
 from core.models import BaseModel, BaseModelName
 
 
 class Status(BaseModel, BaseModelName):
+    task_count = models.PositiveIntegerField(
+        _('tasks'), default=0, editable=False
+    )
+
     class Meta:
         verbose_name = _('Status')
         verbose_name_plural = _('Statuses')
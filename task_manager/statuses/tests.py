@@ -2,11 +2,11 @@ from django.conf import settings
 
 from django.core.exceptions import ObjectDoesNotExist
 from django.shortcuts import reverse
-from django.test import TestCase
+from django.test import TestCase, override_settings
 
 from task_manager.statuses.models import Status
 from task_manager.tasks.models import Task
-from task_manager.tests import SetUpLoggedUserMixin
+from task_manager.tests import SetUpLoggedUserMixin, ConditionalGetTestMixin
 
 
 class TestStatusListView(SetUpLoggedUserMixin, TestCase):
@@ -25,6 +25,36 @@ class TestStatusListView(SetUpLoggedUserMixin, TestCase):
         self.assertRedirects(response, settings.LOGIN_URL)
 
 
+@override_settings(VERSIONED_CACHE=True)
+class TestStatusListViewConditionalGet(SetUpLoggedUserMixin,
+                                       ConditionalGetTestMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.url = reverse('statuses_list')
+        cls.test_status = Status.objects.create(name='Test status')
+
+    def test_status_list_view_not_modified(self):
+        etag = self.get_etag(self.url)
+        self.assertNotModified(self.url, etag)
+
+        self.test_status.name = 'Renamed status'
+        self.test_status.save()
+        self.assertModified(self.url, etag)
+
+    def test_status_list_view_modified_by_tasks(self):
+        etag = self.get_etag(self.url)
+        Task.objects.create(name='Test task', status=self.test_status,
+                            creator=self.logged_user)
+        self.assertModified(self.url, etag)
+
+    @override_settings(VERSIONED_CACHE=False)
+    def test_no_etag_without_shared_cache(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('ETag', response)
+
+
 class TestStatusCreateView(SetUpLoggedUserMixin, TestCase):
     @classmethod
     def setUpTestData(cls):
@@ -1,19 +1,30 @@
 from django.contrib import messages
 from django.contrib.messages.views import SuccessMessageMixin
+from django.db.models import Count, Max
 from django.shortcuts import redirect
 from django.urls import reverse_lazy
 from django.utils.translation import gettext as _
 from django.views.generic import ListView, CreateView, UpdateView, DeleteView
 
-from task_manager.mixins import CustomLoginRequiredMixin
+from task_manager.cache import get_version
+from task_manager.mixins import CustomLoginRequiredMixin, ConditionalGetMixin, \
+    AsyncViewMixin, ReplicaReadMixin
 from task_manager.statuses.models import Status
+from task_manager.tasks.models import Task
 
 
-class StatusListView(CustomLoginRequiredMixin, ListView):
+class StatusListView(AsyncViewMixin, ReplicaReadMixin, CustomLoginRequiredMixin,
+                     ConditionalGetMixin, ListView):
     model = Status
     template_name = 'statuses/list.html'
     context_object_name = 'statuses'
 
+    def get_etag_parts(self):
+        return [
+            *Status.objects.aggregate(Max('updated'), Count('id')).values(),
+            get_version(Task),
+        ]
+
 
 class StatusCreateView(CustomLoginRequiredMixin, SuccessMessageMixin, CreateView):
     model = Status
@@ -1,8 +1,14 @@
 from django.apps import AppConfig
 from django.utils.translation import gettext_lazy as _
 
+from task_manager.cache import track_versions
+
 
 class TasksConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'task_manager.tasks'
     verbose_name = _('Tasks')
+
+    def ready(self):
+        from task_manager.tasks import signals  # noqa: F401
+        track_versions(self.get_model('Task'))
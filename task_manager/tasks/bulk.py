@@ -0,0 +1,100 @@
+from django.db import transaction
+from django.utils import timezone
+
+from task_manager.cache import bump_version
+from task_manager.labels.models import Label
+from task_manager.statuses.models import Status
+from task_manager.tasks.counters import change_task_counts, \
+    change_task_summary, pause_task_counts
+from task_manager.tasks.history import record_changes
+from task_manager.tasks.models import Task
+
+TaskLabels = Task.labels.through
+
+
+def lock(tasks, *fields):
+    return list(tasks.select_for_update().values_list('pk', *fields))
+
+
+def touch(rows, **values):
+    return Task.objects.filter(pk__in=[row[0] for row in rows]) \
+        .update(updated=timezone.now(), **values)
+
+
+def set_status(tasks, status, author=None):
+    rows = lock(tasks.exclude(status=status), 'status_id', 'executor_id')
+    change_task_counts(Status, [status_id for _pk, status_id, _executor_id in rows],
+                       step=-1)
+    change_task_counts(Status, [status.pk] * len(rows))
+    change_task_summary([(status.pk, executor_id) for _pk, _status_id, executor_id in rows],
+                        [row[1:] for row in rows])
+    record_changes([(pk, 'status', status_id, status.pk)
+                    for pk, status_id, _executor_id in rows], author)
+    return touch(rows, status=status)
+
+
+def set_executor(tasks, executor, author=None):
+    rows = lock(tasks.exclude(executor=executor), 'status_id', 'executor_id')
+    change_task_summary([(status_id, executor.pk if executor else None)
+                         for _pk, status_id, _executor_id in rows],
+                        [row[1:] for row in rows])
+    record_changes([(pk, 'executor', executor_id, executor.pk if executor else None)
+                    for pk, _status_id, executor_id in rows], author)
+    return touch(rows, executor=executor)
+
+
+def add_label(tasks, label, author=None):
+    rows = lock(tasks.exclude(labels=label))
+    TaskLabels.objects.bulk_create(
+        TaskLabels(task_id=pk, label_id=label.pk) for pk, in rows
+    )
+    change_task_counts(Label, [label.pk] * len(rows))
+    record_changes([(pk, 'labels', '', label.name) for pk, in rows], author)
+    return touch(rows)
+
+
+def remove_label(tasks, label, author=None):
+    rows = lock(tasks.filter(labels=label))
+    TaskLabels.objects.filter(task__in=[pk for pk, in rows], label=label).delete()
+    change_task_counts(Label, [label.pk] * len(rows), step=-1)
+    record_changes([(pk, 'labels', label.name, '') for pk, in rows], author)
+    return touch(rows)
+
+
+def delete_tasks(tasks, value=None, author=None):
+    # Ownership is part of the locked query, so the rows checked are the
+    # rows deleted.
+    if author is not None:
+        tasks = tasks.filter(creator=author)
+    rows = lock(tasks, 'status_id', 'executor_id', 'name')
+    pks = [pk for pk, _status_id, _executor_id, _name in rows]
+    change_task_counts(Status, [status_id for _pk, status_id, _executor_id, _name in rows],
+                       step=-1)
+    change_task_counts(Label, list(
+        TaskLabels.objects.filter(task__in=pks).values_list('label_id', flat=True)
+    ), step=-1)
+    change_task_summary(removed=[(status_id, executor_id)
+                                 for _pk, status_id, executor_id, _name in rows])
+    record_changes([(pk, 'deleted', name, '') for pk, _status_id, _executor_id, name in rows],
+                   author)
+    with pause_task_counts():
+        Task.objects.filter(pk__in=pks).delete()
+    return len(pks)
+
+
+ACTIONS = {
+    'status': set_status,
+    'executor': set_executor,
+    'add_label': add_label,
+    'remove_label': remove_label,
+    'delete': delete_tasks,
+}
+
+
+def apply_action(action, tasks, value=None, author=None):
+    with transaction.atomic():
+        count = ACTIONS[action](tasks, value, author)
+        if count:
+            bump_version(Task)
+            transaction.on_commit(lambda: bump_version(Task))
+    return count
@@ -0,0 +1,83 @@
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce, Greatest
+
+from task_manager.labels.models import Label
+from task_manager.statuses.models import Status
+from task_manager.tasks.models import ExecutorSummary, Task, TaskSummary
+
+counts_paused = ContextVar('task_counts_paused', default=False)
+
+
+@contextmanager
+def pause_task_counts():
+    token = counts_paused.set(True)
+    try:
+        yield
+    finally:
+        counts_paused.reset(token)
+
+
+def change_task_counts(model, pks, step=1):
+    pks_by_delta = defaultdict(list)
+    for pk, count in Counter(pks).items():
+        pks_by_delta[count * step].append(pk)
+    for delta, pks in pks_by_delta.items():
+        model.objects.filter(pk__in=pks).update(
+            task_count=Greatest(F('task_count') + delta, 0)
+        )
+
+
+def change_summary(model, fields, deltas):
+    for values, delta in deltas.items():
+        if not delta:
+            continue
+        rows = model.objects.filter(**dict(zip(fields, values)))
+        if rows.update(count=Greatest(F('count') + delta, 0)) or delta < 0:
+            continue
+        try:
+            with transaction.atomic():
+                model.objects.create(**dict(zip(fields, values)), count=delta)
+        except IntegrityError:
+            rows.update(count=F('count') + delta)
+
+
+def change_task_summary(added=(), removed=()):
+    # Moves cancel out, a status change leaves the executor totals alone.
+    deltas = Counter(added)
+    deltas.subtract(removed)
+    change_summary(TaskSummary, ['status_id', 'executor_id'], deltas)
+    executor_deltas = Counter()
+    for (_status_id, executor_id), delta in deltas.items():
+        executor_deltas[(executor_id,)] += delta
+    change_summary(ExecutorSummary, ['executor_id'], executor_deltas)
+
+
+def count_subquery(queryset, field):
+    return Coalesce(Subquery(
+        queryset.filter(**{field: OuterRef('pk')})
+        .order_by().values(field).annotate(count=Count('pk')).values('count')
+    ), 0)
+
+
+def refresh_task_counts():
+    Status.objects.update(task_count=count_subquery(Task.objects, 'status'))
+    Label.objects.update(
+        task_count=count_subquery(Task.labels.through.objects, 'label')
+    )
+    TaskSummary.objects.all().delete()
+    TaskSummary.objects.bulk_create(
+        TaskSummary(status_id=status_id, executor_id=executor_id, count=count)
+        for status_id, executor_id, count in Task.objects.order_by()
+        .values_list('status', 'executor').annotate(count=Count('pk'))
+    )
+    ExecutorSummary.objects.all().delete()
+    ExecutorSummary.objects.bulk_create(
+        ExecutorSummary(executor_id=executor_id, count=count)
+        for executor_id, count in Task.objects.order_by()
+        .values_list('executor').annotate(count=Count('pk'))
+    )
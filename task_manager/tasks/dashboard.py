@@ -0,0 +1,25 @@
+from task_manager.labels.models import Label
+from task_manager.statuses.models import Status
+from task_manager.tasks.models import ExecutorSummary
+
+TOP_SIZE = 10
+
+
+def get_executor_counts():
+    return [
+        (row.executor, row.count) for row in ExecutorSummary.objects.filter(count__gt=0)
+        .select_related('executor').order_by('-count', 'executor_id')[:TOP_SIZE]
+    ]
+
+
+def get_dashboard():
+    statuses = list(
+        Status.objects.order_by('-task_count', 'name').values_list('pk', 'name', 'task_count')
+    )
+    return {
+        'total': sum(count for _pk, _name, count in statuses),
+        'statuses': statuses,
+        'executors': get_executor_counts(),
+        'labels': Label.objects.filter(task_count__gt=0).order_by('-task_count', 'name')
+        .values_list('pk', 'name', 'task_count')[:TOP_SIZE],
+    }
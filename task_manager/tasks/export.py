@@ -0,0 +1,98 @@
+import csv
+from collections import defaultdict
+from datetime import datetime
+from itertools import islice
+
+from django.utils import timezone
+
+from task_manager.tasks.models import Task
+
+TASK_FIELDS = {
+    'id': 'id',
+    'name': 'name',
+    'description': 'description',
+    'status': 'status__name',
+    'creator': 'creator__username',
+    'executor': 'executor__username',
+    'labels': None,
+    'created': 'created',
+    'updated': 'updated',
+}
+FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+
+class InvalidFields(ValueError):
+    pass
+
+
+def parse_fields(value):
+    if not value:
+        return list(TASK_FIELDS)
+    fields = [field.strip() for field in value.split(',') if field.strip()]
+    unknown = [field for field in fields if field not in TASK_FIELDS]
+    if unknown or not fields:
+        raise InvalidFields(unknown)
+    return fields
+
+
+def get_columns(fields, extra=()):
+    columns = [TASK_FIELDS[field] for field in fields if TASK_FIELDS[field]]
+    columns += [column for column in extra if column not in columns]
+    if 'labels' in fields and 'id' not in columns:
+        columns.append('id')
+    return columns
+
+
+def iter_chunks(iterable, size):
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def get_label_names(task_ids):
+    names = defaultdict(list)
+    links = Task.labels.through.objects.filter(task_id__in=task_ids) \
+        .order_by('label__name').values_list('task_id', 'label__name')
+    for task_id, name in links:
+        names[task_id].append(name)
+    return names
+
+
+def to_records(rows, fields):
+    label_names = get_label_names([row['id'] for row in rows]) \
+        if 'labels' in fields else {}
+    return [
+        {
+            field: label_names.get(row['id'], []) if field == 'labels'
+            else row[TASK_FIELDS[field]]
+            for field in fields
+        }
+        for row in rows
+    ]
+
+
+class Echo:
+    def write(self, value):
+        return value
+
+
+def format_csv_value(value):
+    if isinstance(value, list):
+        value = ', '.join(value)
+    if isinstance(value, datetime):
+        return timezone.localtime(value).strftime('%Y-%m-%d %H:%M:%S')
+    # Spreadsheets run cells starting with these as formulas.
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return f"'{value}"
+    return value
+
+
+def iter_csv(rows, fields, header, chunk_size):
+    writer = csv.writer(Echo())
+    # The BOM makes Excel open the file as UTF-8.
+    yield '\ufeff' + writer.writerow(header)
+    for chunk in iter_chunks(rows, chunk_size):
+        yield ''.join(
+            writer.writerow([format_csv_value(record[field]) for field in fields])
+            for record in to_records(chunk, fields)
+        )
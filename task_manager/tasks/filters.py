@@ -1,12 +1,39 @@
+from django.conf import settings
+from django.db import models
 from django.forms import CheckboxInput
+from django.urls import reverse_lazy
 from django_filters import FilterSet
-from django_filters.filters import BooleanFilter, ModelChoiceFilter
+from django_filters.fields import ModelChoiceField, ModelChoiceIterator
+from django_filters.filters import BooleanFilter, CharFilter, \
+    ModelChoiceFilter
+from django_filters.filterset import remote_queryset
 from django.utils.translation import gettext as _
+from task_manager.cache import CachedModelChoiceIterator
 from task_manager.tasks.models import Task
+from task_manager.tasks.search import search_tasks
+from task_manager.tasks.widgets import AutocompleteSelect
 from task_manager.labels.models import Label
 
 
+class CachedFilterChoiceIterator(ModelChoiceIterator,
+                                 CachedModelChoiceIterator):
+    pass
+
+
+class CachedModelChoiceField(ModelChoiceField):
+    iterator = CachedFilterChoiceIterator
+
+
+class CachedModelChoiceFilter(ModelChoiceFilter):
+    field_class = CachedModelChoiceField
+
+
 class TaskFilterSet(FilterSet):
+    search = CharFilter(
+        method='filter_search',
+        label=_('Search'),
+    )
+
     own_tasks = BooleanFilter(
         widget=CheckboxInput,
         field_name='creator',
@@ -14,12 +41,24 @@ class TaskFilterSet(FilterSet):
         label=_('Only your own tasks'),
     )
 
-    label = ModelChoiceFilter(
+    label = CachedModelChoiceFilter(
         queryset=Label.objects.all(),
         field_name='labels',
         label=_('Label'),
     )
 
+    def __init__(self, data=None, queryset=None, **kwargs):
+        if queryset is None:
+            queryset = Task.objects.with_related()
+        super().__init__(data, queryset, **kwargs)
+        if settings.TASK_EXECUTOR_AUTOCOMPLETE:
+            self.filters['executor'].extra['widget'] = AutocompleteSelect(
+                reverse_lazy('user_autocomplete')
+            )
+
+    def filter_search(self, queryset, name, value):
+        return search_tasks(queryset, value)
+
     def filter_own_tasks(self, queryset, name, value):
         if value:
             return queryset.filter(creator=self.request.user)
@@ -27,4 +66,10 @@ class TaskFilterSet(FilterSet):
 
     class Meta:
         model = Task
-        fields = ['status', 'executor', 'label', 'own_tasks']
+        fields = ['search', 'status', 'executor', 'label', 'own_tasks']
+        filter_overrides = {
+            models.ForeignKey: {
+                'filter_class': CachedModelChoiceFilter,
+                'extra': lambda field: {'queryset': remote_queryset(field)},
+            },
+        }
@@ -0,0 +1,55 @@
+from django import forms
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.urls import reverse_lazy
+from django.utils.translation import gettext_lazy as _
+
+from task_manager.labels.models import Label
+from task_manager.statuses.models import Status
+from task_manager.tasks.filters import CachedModelChoiceField
+from task_manager.tasks.models import Task
+from task_manager.tasks.widgets import AutocompleteSelect
+
+
+class TaskBulkActionForm(forms.Form):
+    ACTIONS = [
+        ('status', _('Change status')),
+        ('executor', _('Change executor')),
+        ('add_label', _('Add label')),
+        ('remove_label', _('Remove label')),
+        ('delete', _('Delete')),
+    ]
+    ACTION_FIELDS = {
+        'status': 'status',
+        'executor': 'executor',
+        'add_label': 'label',
+        'remove_label': 'label',
+    }
+    REQUIRED_FIELDS = ['status', 'label']
+
+    tasks = forms.ModelMultipleChoiceField(Task.objects.all(), label=_('Tasks'))
+    action = forms.ChoiceField(label=_('Action'), choices=ACTIONS)
+    status = CachedModelChoiceField(Status.objects.all(), label=_('Status'),
+                                    required=False)
+    executor = CachedModelChoiceField(get_user_model().objects.all(),
+                                      label=_('Executor'), required=False)
+    label = CachedModelChoiceField(Label.objects.all(), label=_('Label'),
+                                   required=False)
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if settings.TASK_EXECUTOR_AUTOCOMPLETE:
+            field = self.fields['executor']
+            field.widget = AutocompleteSelect(reverse_lazy('user_autocomplete'))
+            field.widget.choices = field.choices
+
+    def clean(self):
+        cleaned_data = super().clean()
+        field = self.ACTION_FIELDS.get(cleaned_data.get('action'))
+        if field in self.REQUIRED_FIELDS and not cleaned_data.get(field):
+            self.add_error(field, forms.Field.default_error_messages['required'])
+        return cleaned_data
+
+    def get_value(self):
+        field = self.ACTION_FIELDS.get(self.cleaned_data['action'])
+        return self.cleaned_data.get(field)
@@ -0,0 +1,56 @@
+from django.utils import timezone
+
+from task_manager.tasks.models import TaskChange
+
+FIELDS = ['name', 'description', 'status', 'executor']
+HISTORY_LIMIT = 50
+
+
+def get_snapshot(task):
+    return {
+        'name': task.name,
+        'description': task.description,
+        'status': task.status_id,
+        'executor': task.executor_id,
+        'labels': {label.name for label in task.labels.all()},
+    }
+
+
+def diff_snapshots(task_id, before, after):
+    changes = [
+        (task_id, field, before[field], after[field])
+        for field in FIELDS if before[field] != after[field]
+    ]
+    # Labels are logged one row per added or removed label.
+    changes += [(task_id, 'labels', name, '')
+                for name in sorted(before['labels'] - after['labels'])]
+    changes += [(task_id, 'labels', '', name)
+                for name in sorted(after['labels'] - before['labels'])]
+    return changes
+
+
+def make_change(task_id, field, old_value, new_value, **kwargs):
+    # Statuses and executors are stored as ids, the other values as text.
+    if field in ('status', 'executor'):
+        return TaskChange(task_id=task_id, field=field, **kwargs, **{
+            f'old_{field}_id': old_value, f'new_{field}_id': new_value,
+        })
+    if field == 'description':
+        old_value = ''
+    return TaskChange(task_id=task_id, field=field, old_value=old_value,
+                      new_value=new_value, **kwargs)
+
+
+def record_changes(changes, author=None):
+    changed = timezone.now()
+    author_id = author.pk if author else None
+    TaskChange.objects.bulk_create(
+        make_change(*change, changed=changed, author_id=author_id)
+        for change in changes
+    )
+
+
+def get_history(task):
+    return task.changes.select_related(
+        'author', 'old_status', 'new_status', 'old_executor', 'new_executor'
+    ).order_by('-changed', '-id')[:HISTORY_LIMIT]
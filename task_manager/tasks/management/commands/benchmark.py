@@ -0,0 +1,123 @@
+import json
+from pathlib import Path
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+from django.test.utils import override_settings, setup_databases, \
+    teardown_databases
+from django.urls import reverse
+
+from task_manager.benchmark import get_cases, get_regressions, measure
+from task_manager.statuses.models import Status
+from task_manager.tasks.seed import seed_data
+from task_manager.templating import warm_templates
+
+DATASET_OPTIONS = ['tasks', 'users', 'labels', 'statuses', 'seed']
+
+
+class Command(BaseCommand):
+    help = 'Seed a throwaway test database and measure query counts, ' \
+           'latency and memory of every page'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tasks', type=int, default=100000)
+        parser.add_argument('--users', type=int, default=10000)
+        parser.add_argument('--labels', type=int, default=500)
+        parser.add_argument('--statuses', type=int, default=10)
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--repeat', type=int, default=20)
+        parser.add_argument('--baseline', default=str(
+            Path(settings.BASE_DIR) / 'benchmarks' / 'baseline.json'
+        ))
+        parser.add_argument('--save', action='store_true',
+                            help='Store the results as the new baseline')
+        parser.add_argument('--compare', action='store_true',
+                            help='Fail if the results regress against the baseline')
+        parser.add_argument('--tolerance', type=float, default=0.25,
+                            help='Allowed relative growth of latency and memory')
+        parser.add_argument('--warm-templates', action='store_true',
+                            help='Compile the templates before the first requests '
+                                 'like a worker started with TEMPLATE_WARMUP')
+
+    def handle(self, *args, **options):
+        dataset = {name: options[name] for name in DATASET_OPTIONS}
+        baseline = self.load_baseline(options['baseline'], dataset) \
+            if options['compare'] else None
+
+        with override_settings(
+            DEBUG=False,
+            ALLOWED_HOSTS=['testserver'],
+            CACHES={'default': {
+                'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            }},
+            # A single process, so the local cache can hold the versions.
+            VERSIONED_CACHE=True,
+        ):
+            old_config = setup_databases(verbosity=0, interactive=False)
+            try:
+                if options['warm_templates']:
+                    warm_templates()
+                results = self.run(dataset, max(2, options['repeat']))
+            finally:
+                teardown_databases(old_config, verbosity=0)
+
+        if options['save']:
+            path = Path(options['baseline'])
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(json.dumps(
+                {'dataset': dataset, 'results': results}, indent=2
+            ) + '\n')
+            self.stdout.write(f'Baseline saved to {path}')
+        if baseline is not None:
+            self.compare(results, baseline, options['tolerance'])
+
+    def run(self, dataset, repeat):
+        users = seed_data(
+            dataset['tasks'], dataset['users'], dataset['labels'],
+            dataset['statuses'], prefix='bench', seed=dataset['seed'],
+        )
+        client = Client()
+        client.force_login(users[0])
+        status = Status.objects.order_by('pk').first()
+        tasks_url = reverse('tasks_list')
+        cases = get_cases(users[0], [
+            ('tasks_list:status', f'{tasks_url}?{urlencode({"status": status.pk})}'),
+            ('tasks_list:search', f'{tasks_url}?{urlencode({"search": "report"})}'),
+            ('tasks_api:page_size', f'{reverse("tasks_api")}?page_size=1000'),
+        ])
+
+        results = {}
+        self.stdout.write(f'{"url":<24} {"status":>6} {"queries":>7} {"first ms":>9} '
+                          f'{"p50 ms":>9} {"p95 ms":>9} {"cpu ms":>9} {"peak KiB":>10}')
+        for name, url in cases:
+            result = results[name] = measure(client, url, repeat)
+            self.stdout.write(
+                f'{name:<24} {result["status"]:>6} {result["queries"]:>7} '
+                f'{result["first_ms"]:>9} {result["p50_ms"]:>9} {result["p95_ms"]:>9} '
+                f'{result["cpu_ms"]:>9} {result["peak_kib"]:>10}'
+            )
+        return results
+
+    def load_baseline(self, path, dataset):
+        try:
+            baseline = json.loads(Path(path).read_text())
+        except FileNotFoundError:
+            # Timings only compare on the machine that recorded them, so a
+            # fresh checkout has no baseline yet.
+            self.stderr.write(self.style.WARNING(
+                f'No baseline at {path}, record one with --save, nothing to compare'
+            ))
+            return None
+        if baseline['dataset'] != dataset:
+            raise CommandError(
+                f'The baseline was recorded with {baseline["dataset"]}, not {dataset}'
+            )
+        return baseline['results']
+
+    def compare(self, results, baseline, tolerance):
+        regressions = get_regressions(results, baseline, tolerance)
+        if regressions:
+            raise CommandError('Regressions against the baseline:\n' + '\n'.join(regressions))
+        self.stdout.write(self.style.SUCCESS('No regressions against the baseline'))
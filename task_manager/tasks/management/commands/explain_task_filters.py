@@ -0,0 +1,61 @@
+from itertools import combinations
+from types import SimpleNamespace
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.utils import timezone
+
+from task_manager.labels.models import Label
+from task_manager.tasks.filters import TaskFilterSet
+from task_manager.tasks.models import Task
+from task_manager.tasks.seed import seed_data
+
+
+class Command(BaseCommand):
+    help = 'Print query plans of the task list for every filter combination'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--seed', type=int, default=0,
+            help='Insert this many synthetic tasks before explaining, '
+                 'the data is rolled back afterwards',
+        )
+        parser.add_argument('--batch-size', type=int, default=5000)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            if options['seed']:
+                self.seed(options['seed'], options['batch_size'])
+            self.explain_all()
+            transaction.set_rollback(True)
+
+    def seed(self, count, batch_size):
+        suffix = timezone.now().strftime('%Y%m%d%H%M%S')
+        seed_data(count, users=50, labels=20, statuses=5,
+                  prefix=f'explain-{suffix}', batch_size=batch_size)
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute('ANALYZE')
+        self.stdout.write(f'Seeded {count} tasks')
+
+    def explain_all(self):
+        task = Task.objects.order_by('?').first()
+        if task is None:
+            self.stdout.write('No tasks to explain, use --seed')
+            return
+        values = {
+            'status': task.status_id,
+            'executor': task.executor_id or task.creator_id,
+            'label': Label.objects.values_list('pk', flat=True).first(),
+            'own_tasks': True,
+        }
+        request = SimpleNamespace(user=task.creator)
+        for size in range(len(values) + 1):
+            for names in combinations(values, size):
+                data = {name: values[name] for name in names}
+                queryset = TaskFilterSet(data, request=request).qs
+                plan = queryset.order_by('created', 'id')[:50].explain()
+                self.stdout.write(self.style.MIGRATE_HEADING(
+                    ', '.join(names) or 'no filters'
+                ))
+                self.stdout.write(plan)
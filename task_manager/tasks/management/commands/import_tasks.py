@@ -0,0 +1,133 @@
+import csv
+import json
+from pathlib import Path
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from task_manager.cache import bump_version
+from task_manager.labels.models import Label
+from task_manager.statuses.models import Status
+from task_manager.tasks.counters import change_task_counts, change_task_summary
+from task_manager.tasks.export import iter_chunks
+from task_manager.tasks.models import Task
+
+TaskLabels = Task.labels.through
+
+
+class Command(BaseCommand):
+    help = 'Import tasks from a CSV or JSON Lines file with the columns ' \
+           'name, description, status, creator, executor, labels and created, ' \
+           'CSV labels are separated by ";"'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path')
+        parser.add_argument('--format', choices=['csv', 'jsonl'],
+                            help='Defaults to jsonl for .jsonl files, csv otherwise')
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--create-missing', action='store_true',
+                            help='Create unknown statuses and labels')
+
+    def handle(self, *args, **options):
+        path = Path(options['path'])
+        if not path.is_file():
+            raise CommandError(f'No such file: {path}')
+        file_format = options['format'] or \
+            ('jsonl' if path.suffix in ('.jsonl', '.ndjson') else 'csv')
+        self.create_missing = options['create_missing']
+        self.statuses = dict(Status.objects.values_list('name', 'pk'))
+        self.labels = dict(Label.objects.values_list('name', 'pk'))
+        self.users = dict(get_user_model().objects.values_list('username', 'pk'))
+
+        imported = 0
+        with path.open(newline='', encoding='utf-8') as file, transaction.atomic():
+            records = self.read_csv(file) if file_format == 'csv' \
+                else self.read_jsonl(file)
+            for batch in iter_chunks(records, options['batch_size']):
+                self.import_batch(batch)
+                imported += len(batch)
+                if options['verbosity'] > 1:
+                    self.stdout.write(f'Imported {imported} tasks')
+        bump_version(Task)
+        self.stdout.write(self.style.SUCCESS(f'Imported {imported} tasks'))
+
+    def read_csv(self, file):
+        for line, row in enumerate(csv.DictReader(file), start=2):
+            labels = [name.strip() for name in (row.get('labels') or '').split(';')]
+            yield line, {**row, 'labels': [name for name in labels if name]}
+
+    def read_jsonl(self, file):
+        for line, text in enumerate(file, start=1):
+            if text.strip():
+                try:
+                    yield line, json.loads(text)
+                except ValueError as e:
+                    raise CommandError(f'Line {line}: {e}')
+
+    def import_batch(self, batch):
+        tasks, task_labels = [], []
+        for line, record in batch:
+            tasks.append(self.build_task(line, record))
+            task_labels.append([
+                self.resolve(self.labels, Label, name, line)
+                for name in record.get('labels') or []
+            ])
+        try:
+            tasks = Task.objects.bulk_create(tasks)
+        except IntegrityError as e:
+            raise CommandError(f'Lines {batch[0][0]}-{batch[-1][0]}: {e}')
+
+        TaskLabels.objects.bulk_create(
+            TaskLabels(task_id=task.pk, label_id=label_id)
+            for task, label_ids in zip(tasks, task_labels)
+            for label_id in set(label_ids)
+        )
+        change_task_counts(Status, [task.status_id for task in tasks])
+        change_task_summary([(task.status_id, task.executor_id) for task in tasks])
+        change_task_counts(
+            Label, [label_id for label_ids in task_labels for label_id in set(label_ids)]
+        )
+
+    def build_task(self, line, record):
+        if not record.get('name'):
+            raise CommandError(f'Line {line}: name is required')
+        return Task(
+            name=record['name'],
+            description=record.get('description') or '',
+            status_id=self.resolve(self.statuses, Status, record.get('status'), line),
+            creator_id=self.resolve_user(record.get('creator'), line),
+            executor_id=self.resolve_user(record.get('executor'), line)
+            if record.get('executor') else None,
+            created=self.parse_created(record.get('created'), line),
+        )
+
+    def parse_created(self, value, line):
+        if not value:
+            return timezone.now()
+        try:
+            created = parse_datetime(value)
+        except ValueError:
+            created = None
+        if created is None:
+            raise CommandError(f'Line {line}: invalid date "{value}"')
+        if timezone.is_naive(created):
+            created = timezone.make_aware(created)
+        return created
+
+    def resolve(self, lookup, model, name, line):
+        if name in lookup:
+            return lookup[name]
+        if not name or not self.create_missing:
+            raise CommandError(
+                f'Line {line}: unknown {model._meta.model_name} "{name}"'
+            )
+        lookup[name] = model.objects.create(name=name).pk
+        return lookup[name]
+
+    def resolve_user(self, username, line):
+        if username not in self.users:
+            raise CommandError(f'Line {line}: unknown user "{username}"')
+        return self.users[username]
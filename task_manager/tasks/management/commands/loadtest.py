@@ -0,0 +1,119 @@
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.error import HTTPError, URLError
+from urllib.request import Request, urlopen
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+
+
+class Command(BaseCommand):
+    help = 'Send concurrent GET requests to a running server and report ' \
+           'throughput and latency'
+
+    def add_arguments(self, parser):
+        parser.add_argument('url', help='For example http://127.0.0.1:8000/tasks/')
+        parser.add_argument('--concurrency', type=int, default=50)
+        parser.add_argument('--requests', type=int, default=1000)
+        parser.add_argument('--timeout', type=float, default=30)
+        parser.add_argument('--user', help='Send the session cookie of this user, '
+                                           'the server must use the same database')
+        parser.add_argument('--db-connections', action='store_true',
+                            help='Sample the PostgreSQL connection count during the test')
+
+    def handle(self, *args, **options):
+        headers = {}
+        if options['user']:
+            headers['Cookie'] = self.get_session_cookie(options['user'])
+        request = Request(options['url'], headers=headers)
+
+        sampler = ConnectionSampler() if options['db_connections'] else None
+        if sampler:
+            sampler.start()
+        start = time.perf_counter()
+        with ThreadPoolExecutor(options['concurrency']) as executor:
+            results = list(executor.map(
+                lambda _i: self.send(request, options['timeout']),
+                range(options['requests']),
+            ))
+        elapsed = time.perf_counter() - start
+        self.report(results, elapsed, options['concurrency'])
+        if sampler:
+            sampler.stop()
+            self.stdout.write(
+                f'db connections: before {sampler.samples[0]}, '
+                f'min {min(sampler.samples)}, max {max(sampler.samples)}, '
+                f'after {sampler.samples[-1]}'
+            )
+
+    def send(self, request, timeout):
+        start = time.perf_counter()
+        try:
+            with urlopen(request, timeout=timeout) as response:
+                response.read()
+                status = response.status
+        except HTTPError as e:
+            status = e.code
+        except (URLError, OSError):
+            status = None
+        return status, time.perf_counter() - start
+
+    def get_session_cookie(self, username):
+        try:
+            user = get_user_model().objects.get(username=username)
+        except get_user_model().DoesNotExist:
+            raise CommandError(f'Unknown user "{username}"')
+        client = Client()
+        client.force_login(user)
+        name = settings.SESSION_COOKIE_NAME
+        return f'{name}={client.cookies[name].value}'
+
+    def report(self, results, elapsed, concurrency):
+        durations = sorted(duration * 1000 for _status, duration in results)
+        statuses = [status for status, _duration in results]
+        failed = sum(status is None or status >= 500 for status in statuses)
+        percentiles = statistics.quantiles(durations, n=100, method='inclusive') \
+            if len(durations) > 1 else durations * 99
+        self.stdout.write(
+            f'{len(results)} requests, concurrency {concurrency}, {elapsed:.2f} s\n'
+            f'throughput: {len(results) / elapsed:.1f} req/s\n'
+            f'latency ms: p50 {percentiles[49]:.1f}, p95 {percentiles[94]:.1f}, '
+            f'p99 {percentiles[98]:.1f}, max {durations[-1]:.1f}\n'
+            f'failed: {failed}'
+        )
+
+
+class ConnectionSampler(threading.Thread):
+    interval = 0.5
+
+    def __init__(self):
+        if connection.vendor != 'postgresql':
+            raise CommandError('--db-connections needs PostgreSQL')
+        super().__init__(daemon=True)
+        self.samples = [self.count()]
+        self.stopped = threading.Event()
+
+    def count(self):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT count(*) FROM pg_stat_activity '
+                'WHERE datname = current_database() AND pid <> pg_backend_pid()'
+            )
+            return cursor.fetchone()[0]
+
+    def run(self):
+        try:
+            while not self.stopped.wait(self.interval):
+                self.samples.append(self.count())
+        finally:
+            connection.close()
+
+    def stop(self):
+        self.stopped.set()
+        self.join()
+        self.samples.append(self.count())
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from task_manager.tasks.counters import refresh_task_counts
+
+
+class Command(BaseCommand):
+    help = 'Recompute the task counters of statuses and labels ' \
+           'and the task summary of the dashboard'
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            refresh_task_counts()
+        self.stdout.write(self.style.SUCCESS('Task counters refreshed'))
@@ -0,0 +1,18 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from task_manager.templating import warm_templates
+
+
+class Command(BaseCommand):
+    help = 'Compile every template, fails on syntax errors and reports ' \
+           'how long a worker spends on the warm-up'
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        count = warm_templates()
+        duration = (time.perf_counter() - start) * 1000
+        self.stdout.write(self.style.SUCCESS(
+            f'Compiled {count} templates in {duration:.1f} ms'
+        ))
@@ -0,0 +1,82 @@
+from django.contrib.postgres.indexes import GinIndex
+from django.db import migrations, models
+from django.db.models.functions import Upper
+
+from task_manager.tasks.search import FTS_TABLE, get_search_vector
+
+
+def get_postgresql_indexes():
+    return [
+        GinIndex(get_search_vector(), name='task_search_idx'),
+        GinIndex(
+            models.OpClass(Upper('name'), name='gin_trgm_ops'),
+            name='task_name_trgm_idx',
+        ),
+    ]
+
+
+# SQLite rebuilds a table when altering it, which drops these triggers, so
+# later migrations that alter tasks_task have to recreate them.
+SQLITE_CREATE = [
+    f"""CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5(
+        name, description, content='tasks_task', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )""",
+    f"""CREATE TRIGGER tasks_task_fts_insert AFTER INSERT ON tasks_task BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, name, description)
+        VALUES (new.id, new.name, new.description);
+    END""",
+    f"""CREATE TRIGGER tasks_task_fts_delete AFTER DELETE ON tasks_task BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, description)
+        VALUES ('delete', old.id, old.name, old.description);
+    END""",
+    f"""CREATE TRIGGER tasks_task_fts_update
+    AFTER UPDATE OF name, description ON tasks_task BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, description)
+        VALUES ('delete', old.id, old.name, old.description);
+        INSERT INTO {FTS_TABLE}(rowid, name, description)
+        VALUES (new.id, new.name, new.description);
+    END""",
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')",
+]
+
+SQLITE_DROP = [
+    'DROP TRIGGER IF EXISTS tasks_task_fts_insert',
+    'DROP TRIGGER IF EXISTS tasks_task_fts_delete',
+    'DROP TRIGGER IF EXISTS tasks_task_fts_update',
+    f'DROP TABLE IF EXISTS {FTS_TABLE}',
+]
+
+
+def add_search(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+        task = apps.get_model('tasks', 'Task')
+        for index in get_postgresql_indexes():
+            schema_editor.add_index(task, index)
+    elif vendor == 'sqlite':
+        for sql in SQLITE_CREATE:
+            schema_editor.execute(sql)
+
+
+def remove_search(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        task = apps.get_model('tasks', 'Task')
+        for index in get_postgresql_indexes():
+            schema_editor.remove_index(task, index)
+    elif vendor == 'sqlite':
+        for sql in SQLITE_DROP:
+            schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0004_task_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(add_search, remove_search),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.0.14 on 2026-10-18 02:24
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0005_task_search'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskChange',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('changed', models.DateTimeField(default=django.utils.timezone.now, verbose_name='changed')),
+                ('author', models.CharField(blank=True, max_length=255, verbose_name='author')),
+                ('field', models.CharField(choices=[('name', 'Name'), ('description', 'description'), ('status', 'status'), ('executor', 'executor'), ('labels', 'labels')], max_length=20, verbose_name='field')),
+                ('old_value', models.TextField(blank=True, verbose_name='old value')),
+                ('new_value', models.TextField(blank=True, verbose_name='new value')),
+                ('task', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='changes', to='tasks.task', verbose_name='Task')),
+            ],
+            options={
+                'verbose_name': 'Task change',
+                'verbose_name_plural': 'Task changes',
+                'indexes': [models.Index(fields=['task', 'changed', 'id'], name='task_change_task_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 5.0.14 on 2026-10-18 02:27
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def summarize_tasks(apps, schema_editor):
+    task_summary = apps.get_model('tasks', 'TaskSummary')
+    task_summary.objects.bulk_create(
+        task_summary(status_id=status_id, executor_id=executor_id, count=count)
+        for status_id, executor_id, count in apps.get_model('tasks', 'Task').objects
+        .order_by().values_list('status', 'executor').annotate(count=Count('pk'))
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('statuses', '0003_status_task_count'),
+        ('tasks', '0006_task_change'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskSummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('count', models.PositiveIntegerField(default=0, verbose_name='tasks')),
+                ('executor', models.ForeignKey(db_index=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL, verbose_name='executor')),
+                ('status', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='statuses.status', verbose_name='status')),
+            ],
+            options={
+                'verbose_name': 'Task summary',
+                'verbose_name_plural': 'Task summaries',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='tasksummary',
+            constraint=models.UniqueConstraint(condition=models.Q(('executor__isnull', False)), fields=('executor', 'status'), name='task_summary_executor_status_uniq'),
+        ),
+        migrations.AddConstraint(
+            model_name='tasksummary',
+            constraint=models.UniqueConstraint(condition=models.Q(('executor__isnull', True)), fields=('status',), name='task_summary_unassigned_uniq'),
+        ),
+        migrations.RunPython(summarize_tasks, migrations.RunPython.noop),
+    ]
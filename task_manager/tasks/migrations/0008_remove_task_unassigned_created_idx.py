@@ -0,0 +1,17 @@
+# Generated by Django 5.0.14 on 2026-10-18 03:21
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0007_task_summary'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='task',
+            name='task_unassigned_created_idx',
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.0.14 on 2026-10-18 03:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0008_remove_task_unassigned_created_idx'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='taskchange',
+            name='field',
+            field=models.CharField(choices=[('name', 'name'), ('description', 'description'), ('status', 'status'), ('executor', 'executor'), ('labels', 'labels')], max_length=20, verbose_name='field'),
+        ),
+    ]
@@ -0,0 +1,97 @@
+# Generated by Django 5.0.14 on 2026-10-18 09:12
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, F, Min, Value
+from django.db.models.functions import Concat
+
+
+def get_unique_ids(queryset, name):
+    # Only names that point to a single row can be turned back into ids.
+    return {
+        value: pk for value, pk, count in queryset.order_by().values_list(name)
+        .annotate(first_pk=Min('pk'), count=Count('pk'))
+        if count == 1
+    }
+
+
+def store_ids(apps, schema_editor):
+    task_change = apps.get_model('tasks', 'TaskChange')
+    statuses = get_unique_ids(apps.get_model('statuses', 'Status').objects, 'name')
+    users = get_unique_ids(
+        apps.get_model(settings.AUTH_USER_MODEL).objects
+        .annotate(full_name=Concat(F('first_name'), Value(' '), F('last_name'))),
+        'full_name'
+    )
+    changes = list(task_change.objects.all())
+    for change in changes:
+        change.author_id = users.get(change.author_name)
+        if change.field in ('status', 'executor'):
+            ids = statuses if change.field == 'status' else users
+            setattr(change, f'old_{change.field}_id', ids.get(change.old_value))
+            setattr(change, f'new_{change.field}_id', ids.get(change.new_value))
+            change.old_value = change.new_value = ''
+        elif change.field == 'description':
+            change.old_value = ''
+    task_change.objects.bulk_update(
+        changes, ['author', 'old_status', 'new_status', 'old_executor',
+                  'new_executor', 'old_value', 'new_value'], batch_size=1000
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('statuses', '0003_status_task_count'),
+        ('tasks', '0009_taskchange_field_choices'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RenameField(
+            model_name='taskchange',
+            old_name='author',
+            new_name='author_name',
+        ),
+        migrations.AddField(
+            model_name='taskchange',
+            name='author',
+            field=models.ForeignKey(db_constraint=False, db_index=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to=settings.AUTH_USER_MODEL, verbose_name='author'),
+        ),
+        migrations.AddField(
+            model_name='taskchange',
+            name='new_executor',
+            field=models.ForeignKey(db_constraint=False, db_index=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to=settings.AUTH_USER_MODEL, verbose_name='new executor'),
+        ),
+        migrations.AddField(
+            model_name='taskchange',
+            name='new_status',
+            field=models.ForeignKey(db_constraint=False, db_index=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='statuses.status', verbose_name='new status'),
+        ),
+        migrations.AddField(
+            model_name='taskchange',
+            name='old_executor',
+            field=models.ForeignKey(db_constraint=False, db_index=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to=settings.AUTH_USER_MODEL, verbose_name='old executor'),
+        ),
+        migrations.AddField(
+            model_name='taskchange',
+            name='old_status',
+            field=models.ForeignKey(db_constraint=False, db_index=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='statuses.status', verbose_name='old status'),
+        ),
+        migrations.RunPython(store_ids, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name='taskchange',
+            name='author_name',
+        ),
+        migrations.AlterField(
+            model_name='taskchange',
+            name='field',
+            field=models.CharField(choices=[('name', 'name'), ('description', 'description'), ('status', 'status'), ('executor', 'executor'), ('labels', 'labels'), ('deleted', 'deleted')], max_length=20, verbose_name='field'),
+        ),
+        migrations.AlterField(
+            model_name='taskchange',
+            name='task',
+            field=models.ForeignKey(db_constraint=False, db_index=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='changes', to='tasks.task', verbose_name='Task'),
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 5.0.14 on 2026-10-18 03:58
+
+import django.db.models.deletion
+import django.db.models.functions.comparison
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def summarize_executors(apps, schema_editor):
+    executor_summary = apps.get_model('tasks', 'ExecutorSummary')
+    executor_summary.objects.bulk_create(
+        executor_summary(executor_id=executor_id, count=count)
+        for executor_id, count in apps.get_model('tasks', 'Task').objects
+        .order_by().values_list('executor').annotate(count=Count('pk'))
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0010_taskchange_ids'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExecutorSummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('count', models.PositiveIntegerField(default=0, verbose_name='tasks')),
+                ('executor', models.ForeignKey(db_index=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL, verbose_name='executor')),
+            ],
+            options={
+                'verbose_name': 'Executor summary',
+                'verbose_name_plural': 'Executor summaries',
+                'indexes': [models.Index(fields=['-count', 'executor'], name='executor_summary_count_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='executorsummary',
+            constraint=models.UniqueConstraint(django.db.models.functions.comparison.Coalesce('executor', 0), name='executor_summary_executor_uniq'),
+        ),
+        migrations.RunPython(summarize_executors, migrations.RunPython.noop),
+    ]
@@ -1,18 +1,28 @@
 from django.contrib.auth import get_user_model
-from django.db import models
+from django.db import models, transaction
+from django.db.models.functions import Coalesce
+from django.utils import timezone
 from task_manager.labels.models import Label
 from task_manager.statuses.models import Status
 from django.utils.translation import gettext_lazy as _
 from core.models import BaseModel, BaseModelName
 
 
+class TaskQuerySet(models.QuerySet):
+    def with_related(self):
+        return self.select_related(
+            'status', 'creator', 'executor'
+        ).prefetch_related('labels')
+
+
 class Task(BaseModel, BaseModelName):
     description = models.TextField(_('description'), blank=True)
 
     creator = models.ForeignKey(get_user_model(),
                                 on_delete=models.PROTECT,
                                 verbose_name=_('creator'),
-                                related_name='create_tasks'
+                                related_name='create_tasks',
+                                db_index=False
                                 )
 
     executor = models.ForeignKey(get_user_model(),
@@ -20,13 +30,15 @@ class Task(BaseModel, BaseModelName):
                                  verbose_name=_('executor'),
                                  related_name='executor_tasks',
                                  blank=True,
-                                 null=True
+                                 null=True,
+                                 db_index=False
                                  )
 
     status = models.ForeignKey(Status,
                                on_delete=models.PROTECT,  # сносим 1 статус
                                verbose_name=_('status'),
-                               related_name='tasks'
+                               related_name='tasks',
+                               db_index=False
                                )
 
     labels = models.ManyToManyField(Label,
@@ -35,6 +47,171 @@ class Task(BaseModel, BaseModelName):
                                     blank=True,
                                     )
 
+    objects = TaskQuerySet.as_manager()
+
+    def save(self, *args, **kwargs):
+        # The counter signals lock the stored row, which has to stay locked
+        # until the counters are changed.
+        with transaction.atomic(savepoint=False):
+            super().save(*args, **kwargs)
+
     class Meta:
         verbose_name = _('Task')
         verbose_name_plural = _('Tasks')
+        indexes = [
+            models.Index(fields=['created', 'id'],
+                         name='task_created_idx'),
+            models.Index(fields=['status', 'created', 'id'],
+                         name='task_status_created_idx'),
+            models.Index(fields=['executor', 'created', 'id'],
+                         name='task_executor_created_idx'),
+            models.Index(fields=['creator', 'created', 'id'],
+                         name='task_creator_created_idx'),
+            models.Index(fields=['status', 'executor', 'created', 'id'],
+                         name='task_status_executor_idx'),
+        ]
+
+
+class TaskChange(models.Model):
+    FIELDS = [
+        ('name', _('name')),
+        ('description', _('description')),
+        ('status', _('status')),
+        ('executor', _('executor')),
+        ('labels', _('labels')),
+        ('deleted', _('deleted')),
+    ]
+
+    # The log outlives the task and the rows it points to, so the references
+    # are plain ids without constraints, joined when the panel is shown.
+    task = models.ForeignKey(Task,
+                             on_delete=models.DO_NOTHING,
+                             db_constraint=False,
+                             verbose_name=_('Task'),
+                             related_name='changes',
+                             db_index=False
+                             )
+    changed = models.DateTimeField(_('changed'), default=timezone.now)
+    author = models.ForeignKey(get_user_model(),
+                               on_delete=models.DO_NOTHING,
+                               db_constraint=False,
+                               null=True,
+                               verbose_name=_('author'),
+                               related_name='+',
+                               db_index=False
+                               )
+    field = models.CharField(_('field'), max_length=20, choices=FIELDS)
+    old_status = models.ForeignKey(Status,
+                                   on_delete=models.DO_NOTHING,
+                                   db_constraint=False,
+                                   null=True,
+                                   verbose_name=_('old status'),
+                                   related_name='+',
+                                   db_index=False
+                                   )
+    new_status = models.ForeignKey(Status,
+                                   on_delete=models.DO_NOTHING,
+                                   db_constraint=False,
+                                   null=True,
+                                   verbose_name=_('new status'),
+                                   related_name='+',
+                                   db_index=False
+                                   )
+    old_executor = models.ForeignKey(get_user_model(),
+                                     on_delete=models.DO_NOTHING,
+                                     db_constraint=False,
+                                     null=True,
+                                     verbose_name=_('old executor'),
+                                     related_name='+',
+                                     db_index=False
+                                     )
+    new_executor = models.ForeignKey(get_user_model(),
+                                     on_delete=models.DO_NOTHING,
+                                     db_constraint=False,
+                                     null=True,
+                                     verbose_name=_('new executor'),
+                                     related_name='+',
+                                     db_index=False
+                                     )
+    # Names, labels and the deleted task's name. A description change keeps
+    # only the new text, the old one is in the previous change.
+    old_value = models.TextField(_('old value'), blank=True)
+    new_value = models.TextField(_('new value'), blank=True)
+
+    class Meta:
+        verbose_name = _('Task change')
+        verbose_name_plural = _('Task changes')
+        indexes = [
+            models.Index(fields=['task', 'changed', 'id'],
+                         name='task_change_task_idx'),
+        ]
+
+    def get_display_value(self, status, executor, value):
+        if self.field == 'status':
+            return str(status) if status else ''
+        if self.field == 'executor':
+            return str(executor) if executor else ''
+        return value
+
+    @property
+    def old_display(self):
+        return self.get_display_value(self.old_status, self.old_executor, self.old_value)
+
+    @property
+    def new_display(self):
+        return self.get_display_value(self.new_status, self.new_executor, self.new_value)
+
+
+class TaskSummary(models.Model):
+    status = models.ForeignKey(Status,
+                               on_delete=models.CASCADE,
+                               verbose_name=_('status'),
+                               related_name='+',
+                               db_index=False
+                               )
+    executor = models.ForeignKey(get_user_model(),
+                                 on_delete=models.CASCADE,
+                                 verbose_name=_('executor'),
+                                 related_name='+',
+                                 null=True,
+                                 db_index=False
+                                 )
+    count = models.PositiveIntegerField(_('tasks'), default=0)
+
+    class Meta:
+        verbose_name = _('Task summary')
+        verbose_name_plural = _('Task summaries')
+        # NULL executors are not equal to each other in a unique index,
+        # unassigned tasks get a constraint of their own.
+        constraints = [
+            models.UniqueConstraint(fields=['executor', 'status'],
+                                    condition=models.Q(executor__isnull=False),
+                                    name='task_summary_executor_status_uniq'),
+            models.UniqueConstraint(fields=['status'],
+                                    condition=models.Q(executor__isnull=True),
+                                    name='task_summary_unassigned_uniq'),
+        ]
+
+
+class ExecutorSummary(models.Model):
+    executor = models.ForeignKey(get_user_model(),
+                                 on_delete=models.CASCADE,
+                                 verbose_name=_('executor'),
+                                 related_name='+',
+                                 null=True,
+                                 db_index=False
+                                 )
+    count = models.PositiveIntegerField(_('tasks'), default=0)
+
+    class Meta:
+        verbose_name = _('Executor summary')
+        verbose_name_plural = _('Executor summaries')
+        # Unassigned tasks are counted in the row without an executor.
+        constraints = [
+            models.UniqueConstraint(Coalesce('executor', 0),
+                                    name='executor_summary_executor_uniq'),
+        ]
+        indexes = [
+            models.Index(fields=['-count', 'executor'],
+                         name='executor_summary_count_idx'),
+        ]
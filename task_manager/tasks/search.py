@@ -0,0 +1,57 @@
+import re
+
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.db import connections
+from django.db.models import FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Cast
+
+SEARCH_CONFIG = 'simple'
+FTS_TABLE = 'tasks_task_fts'
+
+
+def get_search_vector():
+    return SearchVector('name', weight='A', config=SEARCH_CONFIG) \
+        + SearchVector('description', weight='B', config=SEARCH_CONFIG)
+
+
+def search_postgresql(queryset, query):
+    vector = get_search_vector()
+    search_query = SearchQuery(query, config=SEARCH_CONFIG, search_type='websearch')
+    # Substring matches on the name cover partial words and are served by
+    # the trigram index, full-text matches rank above them. ts_rank returns
+    # real, which does not survive the round trip through a page cursor, so
+    # the rank is compared as double precision.
+    return queryset.annotate(
+        search_vector=vector,
+        search_rank=Cast(SearchRank(vector, search_query), FloatField()),
+    ).filter(Q(search_vector=search_query) | Q(name__icontains=query))
+
+
+def get_fts_match(query):
+    return ' '.join(f'"{word}"*' for word in re.findall(r'\w+', query))
+
+
+def search_sqlite(queryset, query):
+    match = get_fts_match(query)
+    if not match:
+        return queryset.none()
+    table = queryset.model._meta.db_table
+    return queryset.annotate(search_rank=RawSQL(
+        f'SELECT -bm25({FTS_TABLE}, 10.0, 1.0) FROM {FTS_TABLE} '
+        f'WHERE {FTS_TABLE} MATCH %s AND rowid = "{table}"."id"',
+        [match], output_field=FloatField(),
+    )).filter(pk__in=RawSQL(
+        f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s', [match]
+    ))
+
+
+def search_tasks(queryset, query):
+    vendor = connections[queryset.db].vendor
+    if vendor == 'postgresql':
+        return search_postgresql(queryset, query)
+    if vendor == 'sqlite':
+        return search_sqlite(queryset, query)
+    return queryset.annotate(search_rank=Value(0.0)).filter(
+        Q(name__icontains=query) | Q(description__icontains=query)
+    )
@@ -0,0 +1,52 @@
+import random
+from datetime import datetime, timedelta, timezone
+
+from django.contrib.auth import get_user_model
+
+from task_manager.labels.models import Label
+from task_manager.statuses.models import Status
+from task_manager.tasks.counters import refresh_task_counts
+from task_manager.tasks.models import Task
+
+WORDS = [
+    'report', 'release', 'deploy', 'review', 'design', 'invoice', 'meeting',
+    'backup', 'migration', 'support', 'client', 'budget', 'draft', 'audit',
+    'отчёт', 'релиз', 'проверка', 'встреча', 'клиент', 'бюджет',
+]
+START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def seed_data(tasks, users, labels, statuses, prefix='seed', seed=0,
+              batch_size=5000):
+    rnd = random.Random(seed)
+    statuses = Status.objects.bulk_create(
+        Status(name=f'{prefix}-status-{i}') for i in range(statuses)
+    )
+    labels = Label.objects.bulk_create(
+        Label(name=f'{prefix}-label-{i}') for i in range(labels)
+    )
+    users = get_user_model().objects.bulk_create(
+        (get_user_model()(username=f'{prefix}-user-{i}',
+                          first_name=rnd.choice(WORDS).title(),
+                          last_name=f'{prefix.title()}{i}')
+         for i in range(users)),
+        batch_size=batch_size,
+    )
+    executors = users + [None]
+    for offset in range(0, tasks, batch_size):
+        created = Task.objects.bulk_create(
+            Task(name=f'{prefix}-task-{i} {" ".join(rnd.sample(WORDS, 2))}',
+                 description=' '.join(rnd.choices(WORDS, k=rnd.randint(0, 12))),
+                 status=rnd.choice(statuses),
+                 creator=rnd.choice(users),
+                 executor=rnd.choice(executors),
+                 created=START + timedelta(minutes=i))
+            for i in range(offset, min(offset + batch_size, tasks))
+        )
+        Task.labels.through.objects.bulk_create(
+            Task.labels.through(task_id=task.pk, label_id=label.pk)
+            for task in created
+            for label in rnd.sample(labels, rnd.randint(0, min(3, len(labels))))
+        )
+    refresh_task_counts()
+    return users
@@ -0,0 +1,98 @@
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save, \
+    pre_delete, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from task_manager.cache import bump_version
+from task_manager.labels.models import Label
+from task_manager.statuses.models import Status
+from task_manager.tasks.counters import change_task_counts, \
+    change_task_summary, counts_paused
+from task_manager.tasks.models import Task
+
+TaskLabels = Task.labels.through
+
+
+@receiver(pre_save, sender=Task)
+def load_initial_values(sender, instance, raw=False, **kwargs):
+    # The loaded values may be stale, so concurrent updates of the same task
+    # take their deltas from the locked row, one after another.
+    if raw or instance.pk is None:
+        return
+    stored = Task.objects.select_for_update().filter(pk=instance.pk) \
+        .values_list('status_id', 'executor_id').first()
+    if stored is not None:
+        instance._initial_status_id, instance._initial_executor_id = stored
+
+
+def count_status_change(initial_status_id, status_id):
+    if initial_status_id == status_id:
+        return
+    change_task_counts(Status, [status_id])
+    if initial_status_id is not None:
+        change_task_counts(Status, [initial_status_id], step=-1)
+
+
+@receiver(post_save, sender=Task)
+def count_saved_task(sender, instance, created, raw=False, **kwargs):
+    initial = (None, None) if created \
+        else (instance._initial_status_id, instance._initial_executor_id)
+    current = (instance.status_id, instance.executor_id)
+    if raw or initial == current:
+        return
+    count_status_change(initial[0], current[0])
+    change_task_summary([current], [initial] if initial[0] is not None else [])
+    instance._initial_status_id, instance._initial_executor_id = current
+
+
+@receiver(pre_delete, sender=Task)
+def remember_labels(sender, instance, **kwargs):
+    if counts_paused.get():
+        return
+    instance._deleted_label_ids = list(
+        TaskLabels.objects.filter(task=instance.pk)
+        .values_list('label_id', flat=True)
+    )
+
+
+@receiver(post_delete, sender=Task)
+def uncount_deleted_task(sender, instance, **kwargs):
+    if counts_paused.get():
+        return
+    change_task_counts(Status, [instance.status_id], step=-1)
+    change_task_counts(Label, instance._deleted_label_ids, step=-1)
+    change_task_summary(removed=[(instance.status_id, instance.executor_id)])
+
+
+def get_links(instance, reverse, pk_set=None):
+    links = TaskLabels.objects.filter(
+        **{'label' if reverse else 'task': instance.pk}
+    )
+    if pk_set is not None:
+        links = links.filter(**{'task__in' if reverse else 'label__in': pk_set})
+    return list(links.values_list('task_id', 'label_id'))
+
+
+def touch_tasks(task_ids):
+    # Label changes do not save the task, but its card and ETag follow updated.
+    if not task_ids:
+        return
+    Task.objects.filter(pk__in=set(task_ids)).update(updated=timezone.now())
+    bump_version(Task)
+    transaction.on_commit(lambda: bump_version(Task))
+
+
+@receiver(m2m_changed, sender=TaskLabels)
+def count_label_tasks(sender, instance, action, reverse, pk_set, **kwargs):
+    if action in ('pre_remove', 'pre_clear'):
+        instance._removed_links = get_links(instance, reverse, pk_set)
+    elif action in ('post_remove', 'post_clear'):
+        links = instance._removed_links
+        change_task_counts(Label, [label_id for _, label_id in links], step=-1)
+        touch_tasks([task_id for task_id, _ in links])
+    elif action == 'post_add':
+        links = [(pk, instance.pk) if reverse else (instance.pk, pk)
+                 for pk in pk_set]
+        change_task_counts(Label, [label_id for _, label_id in links])
+        touch_tasks([task_id for task_id, _ in links])
@@ -1,11 +1,27 @@
+import csv
+import json
+import tempfile
+from io import StringIO
+from unittest.mock import patch
+
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.core.exceptions import ObjectDoesNotExist
+from django.core.management import call_command, CommandError
 from django.shortcuts import reverse
-from django.test import TestCase
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils.http import urlencode
+from task_manager.labels.models import Label
+from task_manager.pagination import KeysetPaginator
 from task_manager.statuses.models import Status
-from task_manager.tasks.models import Task
-from task_manager.tests import SetUpLoggedUserMixin
+from task_manager.tasks.bulk import apply_action
+from task_manager.tasks.models import ExecutorSummary, Task, TaskChange, \
+    TaskSummary
+from task_manager.tasks.views import TaskFilterView
+from task_manager.tests import SetUpLoggedUserMixin, QueryCountMixin, \
+    ConditionalGetTestMixin
 
 
 class SetUpLoggedUserAndTestDataTaskMixin(SetUpLoggedUserMixin):
@@ -71,6 +87,597 @@ class LoggedUserAndTestTaskFilterView(SetUpLoggedUserAndTestDataTaskMixin, TestC
         )
 
 
+class TaskFilterViewQueryCount(SetUpLoggedUserAndTestDataTaskMixin,
+                               QueryCountMixin, TestCase):
+    def create_tasks(self):
+        labels = [Label.objects.create(name=f'Label {i}') for i in range(3)]
+        for i in range(10):
+            task = Task.objects.create(name=f'Task {i}',
+                                       status=self.test_status,
+                                       creator=self.logged_user,
+                                       executor=self.other_user)
+            task.labels.set(labels)
+
+    def test_task_filter_view_query_count(self):
+        self.assertConstantQueryCount(reverse('tasks_list'), self.create_tasks)
+
+    def test_task_filter_view_query_count_filtered(self):
+        self.assertConstantQueryCount(
+            reverse('tasks_list'), self.create_tasks,
+            {'status': self.test_status.pk}
+        )
+
+
+@patch.object(TaskFilterView, 'paginate_by', 2)
+class TaskFilterViewKeysetPagination(SetUpLoggedUserAndTestDataTaskMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.url = reverse('tasks_list')
+        for i in range(4):
+            Task.objects.create(name=f'Task {i}', status=cls.test_status,
+                                creator=cls.logged_user)
+
+    def get_page(self, query):
+        response = self.client.get(f'{self.url}?{query}')
+        self.assertEqual(response.status_code, 200)
+        return response.context['page_obj']
+
+    def test_pages_follow_created_and_id(self):
+        seen = []
+        page = self.get_page('')
+        self.assertFalse(page.has_previous())
+        while True:
+            seen.extend(task.pk for task in page)
+            if not page.has_next():
+                break
+            page = self.get_page(page.next_query)
+
+        self.assertEqual(
+            seen,
+            list(Task.objects.order_by('created', 'id').values_list('pk', flat=True))
+        )
+
+        previous_page = self.get_page(page.previous_query)
+        self.assertEqual([task.pk for task in previous_page], seen[2:4])
+
+    def test_pages_keep_filters_and_skip_offset(self):
+        page = self.get_page(f'own_tasks=on&status={self.test_status.pk}')
+        self.assertIn('own_tasks=on', page.next_query)
+
+        with CaptureQueriesContext(connection) as context:
+            page = self.get_page(page.next_query)
+        self.assertTrue(all(task.creator == self.logged_user for task in page))
+        self.assertFalse(any('OFFSET' in query['sql'] for query in context))
+        self.assertTrue(any(
+            '("tasks_task"."created", "tasks_task"."id") >' in query['sql']
+            for query in context
+        ))
+
+    def test_empty_previous_page(self):
+        first_task = Task.objects.order_by('created', 'id').first()
+        cursor = KeysetPaginator(Task.objects.all(), 2, ('created', 'id')) \
+            .encode_cursor(first_task, backwards=True)
+        response = self.client.get(self.url, {'cursor': cursor})
+        self.assertFalse(response.context['page_obj'].object_list)
+        self.assertContains(response, 'href="?"')
+
+    def test_invalid_cursor(self):
+        response = self.client.get(self.url, {'cursor': 'not-a-cursor'})
+        self.assertEqual(response.status_code, 404)
+
+
+@override_settings(VERSIONED_CACHE=True)
+class TaskFilterViewCachedChoices(SetUpLoggedUserAndTestDataTaskMixin,
+                                  QueryCountMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.url = reverse('tasks_list')
+        cls.test_label = Label.objects.create(name='Test label')
+        cls.idle_user = get_user_model().objects.create(
+            username='pablo_picasso', first_name='Pablo', last_name='Picasso'
+        )
+
+    def test_choices_are_cached(self):
+        first = self.get_query_count(self.url)
+        self.assertEqual(self.get_query_count(self.url), first - 3)
+
+    def test_choices_are_invalidated(self):
+        self.client.get(self.url)
+        Status.objects.create(name='Brand new status')
+        self.test_label.delete()
+
+        response = self.client.get(self.url)
+        self.assertContains(response, 'Brand new status')
+        self.assertNotContains(response, 'Test label')
+
+    @override_settings(TASK_EXECUTOR_AUTOCOMPLETE=True)
+    def test_executor_autocomplete(self):
+        response = self.client.get(self.url)
+        self.assertContains(response, reverse('user_autocomplete'))
+        self.assertNotContains(response, 'Pablo Picasso')
+
+        response = self.client.get(self.url, {'executor': self.idle_user.pk})
+        self.assertContains(response, 'Pablo Picasso')
+
+        response = self.client.get(reverse('user_autocomplete'), {'q': 'picas'})
+        self.assertEqual(response.json()['results'],
+                         [{'id': self.idle_user.pk, 'text': 'Pablo Picasso'}])
+
+
+class TaskFilterViewRowCache(SetUpLoggedUserAndTestDataTaskMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.url = reverse('tasks_list')
+        cls.other_task = Task.objects.create(name='Other task',
+                                             status=cls.test_status,
+                                             creator=cls.logged_user)
+
+    def get_rendered_rows(self):
+        response = self.client.get(self.url)
+        return [t.name for t in response.templates].count('tasks/row.html')
+
+    def test_rows_are_rendered_once(self):
+        self.assertEqual(self.get_rendered_rows(), 2)
+        self.assertEqual(self.get_rendered_rows(), 0)
+
+        self.other_task.name = 'Renamed task'
+        self.other_task.save()
+        self.assertEqual(self.get_rendered_rows(), 1)
+        self.assertContains(self.client.get(self.url), 'Renamed task')
+
+    def test_rows_are_invalidated_by_status(self):
+        self.get_rendered_rows()
+        self.test_status.name = 'Renamed status'
+        self.test_status.save()
+        self.assertContains(self.client.get(self.url), 'Renamed status')
+
+    def test_rows_ignore_unrelated_changes(self):
+        self.get_rendered_rows()
+        Status.objects.create(name='Unused status')
+        get_user_model().objects.create(username='idle_user')
+        self.assertEqual(self.get_rendered_rows(), 0)
+
+        self.logged_user.first_name = 'Renamed'
+        self.logged_user.save()
+        self.assertEqual(self.get_rendered_rows(), 1)
+
+
+@override_settings(VERSIONED_CACHE=True)
+class TaskConditionalGet(SetUpLoggedUserAndTestDataTaskMixin,
+                         ConditionalGetTestMixin, TestCase):
+    def test_task_filter_view_not_modified(self):
+        url = reverse('tasks_list')
+        etag = self.get_etag(url)
+        self.assertNotModified(url, etag)
+
+        Task.objects.create(name='New task', status=self.test_status,
+                            creator=self.logged_user)
+        self.assertModified(url, etag)
+
+    def test_task_filter_view_filters_change_etag(self):
+        url = reverse('tasks_list')
+        etag = self.get_etag(url)
+        self.assertModified(f'{url}?status={self.test_status.pk}', etag)
+
+    def test_task_detail_view_not_modified(self):
+        url = reverse('task_detail', kwargs={'pk': self.test_task.pk})
+        etag = self.get_etag(url)
+        self.assertNotModified(url, etag)
+
+        self.test_status.name = 'Renamed status'
+        self.test_status.save()
+        self.assertModified(url, etag)
+
+
+class TestTaskSearch(SetUpLoggedUserAndTestDataTaskMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.url = reverse('tasks_list')
+        cls.in_description = Task.objects.create(
+            name='Quarterly numbers', description='Prepare the annual report draft',
+            status=cls.test_status, creator=cls.logged_user,
+        )
+        cls.in_name = Task.objects.create(
+            name='Annual report', status=cls.test_status, creator=cls.logged_user,
+        )
+
+    def search(self, query, **data):
+        response = self.client.get(self.url, {'search': query, **data})
+        return [task.name for task in response.context['tasks']], response
+
+    def test_search_ranks_name_matches_first(self):
+        names, _response = self.search('annual report')
+        self.assertEqual(names, ['Annual report', 'Quarterly numbers'])
+
+    def test_search_prefix_and_filters(self):
+        self.assertEqual(self.search('quarter')[0], ['Quarterly numbers'])
+        self.assertEqual(self.search('report', own_tasks='on')[0],
+                         ['Annual report', 'Quarterly numbers'])
+        self.assertEqual(self.search('"*')[0], [])
+
+    def test_search_follows_changes(self):
+        self.in_name.name = 'Monthly summary'
+        self.in_name.save()
+        self.assertEqual(self.search('annual')[0], ['Quarterly numbers'])
+        self.in_description.delete()
+        self.assertEqual(self.search('annual')[0], [])
+        self.assertEqual(self.search('monthly')[0], ['Monthly summary'])
+
+    def test_search_pages(self):
+        with patch.object(TaskFilterView, 'paginate_by', 1):
+            names, response = self.search('report')
+            self.assertEqual(names, ['Annual report'])
+            page = response.context['page_obj']
+            response = self.client.get(f'{self.url}?{page.next_query}')
+        self.assertEqual([task.name for task in response.context['tasks']],
+                         ['Quarterly numbers'])
+
+    def test_search_pages_through_tied_ranks(self):
+        tied = [Task.objects.create(name=f'Weekly report {i}', status=self.test_status,
+                                    creator=self.logged_user).pk for i in range(5)]
+        seen = []
+        query = urlencode({'search': 'weekly'})
+        with patch.object(TaskFilterView, 'paginate_by', 2):
+            while query is not None:
+                page = self.client.get(f'{self.url}?{query}').context['page_obj']
+                seen.extend(task.pk for task in page)
+                query = page.next_query if page.has_next() else None
+        self.assertEqual(seen, tied)
+
+
+class TestTaskApiView(SetUpLoggedUserAndTestDataTaskMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.url = reverse('tasks_api')
+        cls.test_label = Label.objects.create(name='Test label')
+        cls.test_task.labels.set([cls.test_label])
+        cls.own_task = Task.objects.create(name='Own task', description='Secret',
+                                           status=cls.test_status,
+                                           creator=cls.logged_user)
+
+    def test_tasks_api_sparse_fields(self):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(self.url, {'fields': 'name,labels'})
+        self.assertEqual(response.json()['results'], [
+            {'name': 'Test task', 'labels': ['Test label']},
+            {'name': 'Own task', 'labels': []},
+        ])
+        self.assertFalse(any('description' in query['sql'] for query in context))
+
+    def test_tasks_api_filters_and_pages(self):
+        response = self.client.get(self.url, {'fields': 'id', 'page_size': 1})
+        data = response.json()
+        self.assertEqual(data['results'], [{'id': self.test_task.pk}])
+
+        data = self.client.get(data['next']).json()
+        self.assertEqual(data['results'], [{'id': self.own_task.pk}])
+        self.assertIsNone(data['next'])
+
+        response = self.client.get(self.url, {'own_tasks': 'on', 'fields': 'id'})
+        self.assertEqual(response.json()['results'], [{'id': self.own_task.pk}])
+
+    def test_tasks_api_stream(self):
+        response = self.client.get(self.url, {'stream': 1, 'fields': 'name,status'})
+        data = json.loads(b''.join(response.streaming_content))
+        self.assertEqual(data['results'], [
+            {'name': 'Test task', 'status': 'Test status'},
+            {'name': 'Own task', 'status': 'Test status'},
+        ])
+
+    def test_tasks_api_errors(self):
+        response = self.client.get(self.url, {'fields': 'password'})
+        self.assertEqual(response.status_code, 400)
+
+        self.client.logout()
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 403)
+
+
+class TestTaskExportView(SetUpLoggedUserAndTestDataTaskMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.url = reverse('tasks_export')
+        cls.test_task.labels.set([
+            Label.objects.create(name='Test label'),
+            Label.objects.create(name='Other label'),
+        ])
+        cls.own_task = Task.objects.create(name='Own task', description='Line 1\nLine 2',
+                                           status=cls.test_status,
+                                           creator=cls.logged_user)
+
+    def get_rows(self, data=None):
+        response = self.client.get(self.url, data)
+        self.assertIn('attachment', response['Content-Disposition'])
+        content = b''.join(response.streaming_content).decode('utf-8-sig')
+        return list(csv.reader(StringIO(content)))
+
+    def test_task_export(self):
+        with self.assertNumQueries(4):
+            rows = self.get_rows()
+        self.assertEqual(rows[0][:3], ['ID', 'Имя', 'Описание'])
+        self.assertEqual(rows[1][1:7], [
+            'Test task', '', 'Test status', 'nelson_mandela', '',
+            'Other label, Test label',
+        ])
+        self.assertEqual(rows[2][1:3], ['Own task', 'Line 1\nLine 2'])
+        self.assertEqual(len(rows), 3)
+
+    def test_task_export_escapes_formulas(self):
+        Task.objects.create(name='=HYPERLINK("http://evil.example","Click")',
+                            description='-1+2', status=self.test_status,
+                            creator=self.logged_user)
+        rows = self.get_rows()
+        self.assertEqual(rows[3][1:3], ['\'=HYPERLINK("http://evil.example","Click")',
+                                        "'-1+2"])
+
+    def test_task_export_uses_filters(self):
+        rows = self.get_rows({'own_tasks': 'on'})
+        self.assertEqual([row[1] for row in rows[1:]], ['Own task'])
+
+    def test_task_export_invalid_filter(self):
+        response = self.client.get(self.url, {'status': 'unknown'})
+        self.assertRedirects(response, f"{reverse('tasks_list')}?status=unknown")
+
+
+class TestTaskBulkActionView(SetUpLoggedUserAndTestDataTaskMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.url = reverse('tasks_bulk')
+        cls.done = Status.objects.create(name='Done')
+        cls.test_label = Label.objects.create(name='Test label')
+        cls.own_tasks = [
+            Task.objects.create(name=f'Own task {i}', status=cls.test_status,
+                                creator=cls.logged_user)
+            for i in range(3)
+        ]
+        cls.own_tasks[0].labels.set([cls.test_label])
+        cls.pks = [task.pk for task in [cls.test_task, *cls.own_tasks]]
+
+    def post(self, action, **data):
+        return self.client.post(self.url, {'tasks': self.pks, 'action': action,
+                                           'next': '/tasks/?own_tasks=on', **data})
+
+    def assertCounts(self, status_count, done_count, label_count):
+        for obj, count in [(self.test_status, status_count),
+                           (self.done, done_count), (self.test_label, label_count)]:
+            obj.refresh_from_db()
+            self.assertEqual(obj.task_count, count)
+
+    def test_bulk_status(self):
+        # Includes creating the summary row of the new status.
+        with self.assertNumQueries(16):
+            response = self.post('status', status=self.done.pk)
+        self.assertRedirects(response, '/tasks/?own_tasks=on')
+        self.assertEqual(Task.objects.filter(status=self.done).count(), 4)
+        self.assertCounts(0, 4, 1)
+        self.assertEqual(
+            set(TaskChange.objects.values_list('field', 'old_status', 'new_status')),
+            {('status', self.test_status.pk, self.done.pk)},
+        )
+        self.assertEqual(TaskChange.objects.filter(task__in=self.pks).count(), 4)
+
+    def test_bulk_executor(self):
+        self.post('executor', executor=self.logged_user.pk)
+        self.assertEqual(Task.objects.filter(executor=self.logged_user).count(), 4)
+        self.post('executor', executor='')
+        self.assertFalse(Task.objects.filter(executor__isnull=False).exists())
+
+    def test_bulk_labels(self):
+        self.post('add_label', label=self.test_label.pk)
+        self.assertEqual(Task.objects.filter(labels=self.test_label).count(), 4)
+        self.assertCounts(4, 0, 4)
+        self.post('remove_label', label=self.test_label.pk)
+        self.assertFalse(Task.objects.filter(labels=self.test_label).exists())
+        self.assertCounts(4, 0, 0)
+        self.assertEqual(TaskChange.objects.filter(new_value='Test label').count(), 3)
+        self.assertEqual(TaskChange.objects.filter(old_value='Test label').count(), 4)
+
+    def test_bulk_delete_own_tasks_only(self):
+        response = self.post('delete')
+        self.assertEqual(list(Task.objects.all()), [self.test_task])
+        self.assertCounts(1, 0, 0)
+        messages = [str(message) for message in response.wsgi_request._messages]
+        self.assertIn('Задачу может удалить только ее автор', messages)
+
+    def test_bulk_delete_keeps_history(self):
+        pks = [task.pk for task in self.own_tasks]
+        self.post('delete')
+        self.assertEqual(
+            list(TaskChange.objects.filter(task__in=pks).values_list('field', 'author')),
+            [('deleted', self.logged_user.pk)] * len(pks),
+        )
+
+    def test_bulk_delete_checks_author_in_locked_query(self):
+        with CaptureQueriesContext(connection) as context:
+            count = apply_action('delete', Task.objects.all(), author=self.logged_user)
+        self.assertEqual(count, 3)
+        # The first select locks the rows to delete.
+        lock_query = next(query['sql'] for query in context
+                          if query['sql'].startswith('SELECT'))
+        self.assertIn('"tasks_task"."creator_id" =', lock_query)
+
+    def test_bulk_errors(self):
+        self.post('status')
+        self.assertEqual(Task.objects.filter(status=self.test_status).count(), 4)
+
+        response = self.client.post(self.url, {'action': 'delete',
+                                               'next': 'https://example.com/'})
+        self.assertRedirects(response, reverse('tasks_list'))
+        self.assertEqual(Task.objects.count(), 4)
+
+    def test_bulk_updates_rows(self):
+        self.client.get(reverse('tasks_list'))
+        self.post('status', status=self.done.pk)
+        response = self.client.get(reverse('tasks_list'))
+        self.assertNotContains(response, '<td>Test status</td>', html=True)
+
+
+class TaskCounters(SetUpLoggedUserAndTestDataTaskMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.other_status = Status.objects.create(name='Other status')
+        cls.labels = [Label.objects.create(name=f'Label {i}') for i in range(2)]
+
+    def assertCounts(self, status_counts, label_counts):
+        for obj, count in zip([self.test_status, self.other_status] + self.labels,
+                              status_counts + label_counts):
+            obj.refresh_from_db()
+            self.assertEqual(obj.task_count, count, obj)
+
+    def test_counters_follow_task_changes(self):
+        self.assertCounts([1, 0], [0, 0])
+
+        self.test_task.labels.set(self.labels)
+        self.assertCounts([1, 0], [1, 1])
+
+        self.test_task.status = self.other_status
+        self.test_task.save()
+        self.test_task.labels.remove(self.labels[0])
+        self.assertCounts([0, 1], [0, 1])
+
+        self.labels[0].tasks.add(self.test_task)
+        self.labels[1].tasks.clear()
+        self.assertCounts([0, 1], [1, 0])
+
+        self.test_task.delete()
+        self.assertCounts([0, 0], [0, 0])
+
+    def test_counters_follow_deferred_task_changes(self):
+        task = Task.objects.only('name').get(pk=self.test_task.pk)
+        task.status = self.other_status
+        task.save()
+        self.assertCounts([0, 1], [0, 0])
+
+        task = Task.objects.defer('status').get(pk=self.test_task.pk)
+        task.name = 'Renamed task'
+        task.save(update_fields=['name'])
+        self.assertCounts([0, 1], [0, 0])
+
+    def test_counters_follow_stale_task_changes(self):
+        stale_task = Task.objects.get(pk=self.test_task.pk)
+        self.test_task.status = self.other_status
+        self.test_task.executor = self.logged_user
+        self.test_task.save()
+        stale_task.status = self.test_status
+        stale_task.save()
+        self.assertCounts([1, 0], [0, 0])
+        self.assertEqual(set(TaskSummary.objects.values_list('status', 'executor', 'count')), {
+            (self.test_status.pk, None, 1),
+            (self.other_status.pk, self.logged_user.pk, 0),
+        })
+
+    def test_refresh_task_counters(self):
+        self.test_task.labels.set(self.labels)
+        Status.objects.update(task_count=5)
+        Label.objects.update(task_count=0)
+
+        call_command('refresh_task_counters', stdout=StringIO())
+        self.assertCounts([1, 0], [1, 1])
+
+    def get_summary(self):
+        return set(TaskSummary.objects.filter(count__gt=0)
+                   .values_list('status', 'executor', 'count'))
+
+    def get_executor_summary(self):
+        return set(ExecutorSummary.objects.filter(count__gt=0)
+                   .values_list('executor', 'count'))
+
+    def test_summary_follows_task_changes(self):
+        self.assertEqual(self.get_summary(), {(self.test_status.pk, None, 1)})
+
+        self.test_task.executor = self.logged_user
+        self.test_task.save()
+        Task.objects.create(name='Other task', status=self.other_status,
+                            creator=self.logged_user, executor=self.logged_user)
+        self.assertEqual(self.get_summary(), {
+            (self.test_status.pk, self.logged_user.pk, 1),
+            (self.other_status.pk, self.logged_user.pk, 1),
+        })
+        self.assertEqual(self.get_executor_summary(), {(self.logged_user.pk, 2)})
+
+        apply_action('status', Task.objects.all(), self.other_status)
+        apply_action('executor', Task.objects.all(), None)
+        self.assertEqual(self.get_summary(), {(self.other_status.pk, None, 2)})
+
+        Task.objects.get(pk=self.test_task.pk).delete()
+        self.assertEqual(self.get_summary(), {(self.other_status.pk, None, 1)})
+        self.assertEqual(self.get_executor_summary(), {(None, 1)})
+
+    def test_refresh_summary(self):
+        TaskSummary.objects.all().delete()
+        ExecutorSummary.objects.all().delete()
+        call_command('refresh_task_counters', stdout=StringIO())
+        self.assertEqual(self.get_summary(), {(self.test_status.pk, None, 1)})
+        self.assertEqual(self.get_executor_summary(), {(None, 1)})
+
+
+class ImportTasksCommand(SetUpLoggedUserAndTestDataTaskMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.test_label = Label.objects.create(name='Test label')
+
+    def import_tasks(self, content, suffix, *args):
+        with tempfile.NamedTemporaryFile('w', suffix=suffix) as file:
+            file.write(content)
+            file.flush()
+            call_command('import_tasks', file.name, '--batch-size', '2', *args,
+                         stdout=StringIO())
+
+    def test_import_csv(self):
+        self.import_tasks(
+            'name,description,status,creator,executor,labels\n'
+            'CSV task 1,First,Test status,nelson_mandela,albert_einstein,Test label\n'
+            'CSV task 2,,Test status,albert_einstein,,Test label;New label\n'
+            'CSV task 3,,New status,albert_einstein,,\n',
+            '.csv', '--create-missing',
+        )
+        task = Task.objects.get(name='CSV task 1')
+        self.assertEqual(task.executor, self.logged_user)
+        self.assertEqual(
+            sorted(Task.objects.get(name='CSV task 2').labels.values_list('name', flat=True)),
+            ['New label', 'Test label']
+        )
+        self.test_status.refresh_from_db()
+        self.test_label.refresh_from_db()
+        self.assertEqual(self.test_status.task_count, 3)
+        self.assertEqual(self.test_label.task_count, 2)
+        self.assertEqual(Status.objects.get(name='New status').task_count, 1)
+
+    def test_import_jsonl(self):
+        self.import_tasks(
+            '{"name": "JSON task", "status": "Test status", "creator": "albert_einstein", '
+            '"labels": ["Test label"], "created": "2024-01-02T03:04:05"}\n',
+            '.jsonl',
+        )
+        task = Task.objects.get(name='JSON task')
+        self.assertEqual(task.created.year, 2024)
+        self.assertEqual(list(task.labels.all()), [self.test_label])
+
+    def test_import_unknown_status(self):
+        with self.assertRaisesMessage(CommandError, 'Line 3: unknown status'):
+            self.import_tasks(
+                'name,status,creator\n'
+                'Task 1,Test status,albert_einstein\n'
+                'Task 2,Missing status,albert_einstein\n',
+                '.csv',
+            )
+        self.assertFalse(Task.objects.filter(name='Task 1').exists())
+
+    def test_import_missing_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            with self.assertRaisesMessage(CommandError, 'No such file'):
+                call_command('import_tasks', directory, stdout=StringIO())
+
+
 class LoggedUserAndTestTaskCreateView(SetUpLoggedUserAndTestDataTaskMixin, TestCase):
     @classmethod
     def setUpTestData(cls):
@@ -111,6 +718,108 @@ class LoggedUserAndTestTaskUpdateView(SetUpLoggedUserAndTestDataTaskMixin, TestC
         self.assertEqual(self.test_task.description, self.data_to_update_task['description'])
 
 
+class TaskChangeHistory(SetUpLoggedUserAndTestDataTaskMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.done = Status.objects.create(name='Done')
+        cls.label = Label.objects.create(name='Urgent')
+
+    def update_task(self):
+        self.client.post(reverse('task_update', kwargs={'pk': self.test_task.pk}), {
+            'name': self.test_task.name,
+            'status': self.done.pk,
+            'executor': self.logged_user.pk,
+            'labels': [self.label.pk],
+        })
+
+    def test_update_records_changed_fields(self):
+        self.update_task()
+        changes = self.test_task.changes.order_by('id')
+        self.assertEqual(
+            [(change.field, change.old_display, change.new_display) for change in changes],
+            [('status', 'Test status', 'Done'),
+             ('executor', '', str(self.logged_user)),
+             ('labels', '', 'Urgent')],
+        )
+        self.assertEqual({change.author for change in changes}, {self.logged_user})
+
+    def test_description_keeps_only_new_text(self):
+        self.client.post(reverse('task_update', kwargs={'pk': self.test_task.pk}), {
+            'name': self.test_task.name,
+            'description': 'New text',
+            'status': self.test_status.pk,
+        })
+        self.assertEqual(
+            list(self.test_task.changes.values_list('field', 'old_value', 'new_value')),
+            [('description', '', 'New text')],
+        )
+
+    def test_field_labels(self):
+        self.assertEqual(
+            [str(label) for _field, label in TaskChange.FIELDS],
+            ['имя', 'описание', 'статус', 'исполнитель', 'метки', 'удалена'],
+        )
+
+    def test_detail_shows_history(self):
+        self.update_task()
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(
+                reverse('task_detail', kwargs={'pk': self.test_task.pk})
+            )
+        self.assertContains(response, '+ Urgent')
+        self.assertEqual(
+            len([query for query in context if 'tasks_taskchange' in query['sql']]), 1
+        )
+
+
+@override_settings(VERSIONED_CACHE=True)
+class TaskDetailCardCache(SetUpLoggedUserAndTestDataTaskMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.label = Label.objects.create(name='Card label')
+        cls.test_task.labels.set([cls.label])
+        cls.url = reverse('task_detail', kwargs={'pk': cls.test_task.pk})
+
+    def test_card_is_loaded_with_one_join_and_one_prefetch(self):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(self.url)
+        self.assertContains(response, 'Card label')
+        task_queries = [query['sql'] for query in context
+                        if 'FROM "tasks_task"' in query['sql']]
+        # The ETag lookup of updated and the joined task query.
+        self.assertEqual(len(task_queries), 2)
+        self.assertIn('JOIN "statuses_status"', task_queries[1])
+        self.assertEqual(
+            len([query for query in context if 'FROM "labels_label"' in query['sql']]), 1
+        )
+
+    def test_card_is_served_from_cache(self):
+        self.client.get(self.url)
+        with self.assertNumQueries(3):
+            response = self.client.get(self.url)
+        self.assertContains(response, 'Card label')
+
+    def test_card_follows_changes(self):
+        self.client.get(self.url)
+        self.label.name = 'Renamed label'
+        self.label.save()
+        self.assertContains(self.client.get(self.url), 'Renamed label')
+
+        self.test_task.labels.clear()
+        self.assertNotContains(self.client.get(self.url), 'Renamed label')
+
+    def test_card_follows_label_side_changes(self):
+        other_label = Label.objects.create(name='Other label')
+        self.client.get(self.url)
+        other_label.tasks.add(self.test_task)
+        self.assertContains(self.client.get(self.url), 'Other label')
+
+        self.label.tasks.clear()
+        self.assertNotContains(self.client.get(self.url), 'Card label')
+
+
 class LoggedUserAndTestTaskDeleteView(SetUpLoggedUserAndTestDataTaskMixin, TestCase):
     @classmethod
     def setUpTestData(cls):
@@ -131,6 +840,11 @@ class LoggedUserAndTestTaskDeleteView(SetUpLoggedUserAndTestDataTaskMixin, TestC
 
         with self.assertRaises(ObjectDoesNotExist):
             Task.objects.get(pk=self.logged_user_task.pk)
+        self.assertEqual(
+            list(TaskChange.objects.filter(task=self.logged_user_task.pk)
+                 .values_list('field', 'old_value')),
+            [('deleted', 'Logged user task')],
+        )
 
     def test_task_delete_view_post_other_user(self):
         response = self.client.post(self.url_other)
@@ -1,10 +1,14 @@
 from django.urls import path
 
 from task_manager.tasks.views import TaskFilterView, TaskCreateView, \
-    TaskUpdateView, TaskDeleteView, TaskDetailView
+    TaskUpdateView, TaskDeleteView, TaskDetailView, TaskApiView, \
+    TaskExportView, TaskBulkActionView
 
 urlpatterns = [
     path('', TaskFilterView.as_view(), name='tasks_list'),
+    path('api/', TaskApiView.as_view(), name='tasks_api'),
+    path('export/', TaskExportView.as_view(), name='tasks_export'),
+    path('bulk/', TaskBulkActionView.as_view(), name='tasks_bulk'),
     path('<int:pk>/', TaskDetailView.as_view(), name='task_detail'),
     path('create/', TaskCreateView.as_view(), name='task_create'),
     path('<int:pk>/update/', TaskUpdateView.as_view(), name='task_update'),
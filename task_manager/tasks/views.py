@@ -1,28 +1,262 @@
+import hashlib
+import json
+
+from django.conf import settings
 from django.contrib import messages
+from django.contrib.auth import get_user_model
+from django.contrib.auth.mixins import LoginRequiredMixin
 from django.contrib.messages.views import SuccessMessageMixin
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models import Count, Max
+from django.http import Http404, JsonResponse, StreamingHttpResponse
 from django.shortcuts import redirect
-from django.urls import reverse_lazy
-from django.utils.translation import gettext as _
+from django.template.loader import render_to_string
+from django.urls import reverse, reverse_lazy
+from django.utils import timezone
+from django.utils.functional import cached_property
+from django.utils.http import url_has_allowed_host_and_scheme
+from django.utils.safestring import mark_safe
+from django.utils.translation import get_language, gettext as _, \
+    gettext_lazy
 from django.views.generic import CreateView, UpdateView, \
-    DeleteView, DetailView
+    DeleteView, DetailView, FormView, View
 from django_filters.views import FilterView
 
-from task_manager.mixins import CustomLoginRequiredMixin
+from task_manager.cache import FRAGMENT_TIMEOUT, get_timeout, get_versions, \
+    render_cached_fragments
+from task_manager.labels.models import Label
+from task_manager.mixins import CustomLoginRequiredMixin, ConditionalGetMixin, \
+    AsyncViewMixin, ReplicaReadMixin
+from task_manager.pagination import KeysetPaginationMixin
+from task_manager.tasks.bulk import apply_action
+from task_manager.tasks.export import InvalidFields, get_columns, \
+    iter_chunks, iter_csv, parse_fields, to_records
 from task_manager.tasks.filters import TaskFilterSet
+from task_manager.tasks.forms import TaskBulkActionForm
+from task_manager.tasks.history import diff_snapshots, get_history, \
+    get_snapshot, record_changes
+from task_manager.statuses.models import Status
 from task_manager.tasks.models import Task
 
 
-class TaskFilterView(CustomLoginRequiredMixin, FilterView):
+class TaskFilterView(AsyncViewMixin, ReplicaReadMixin, CustomLoginRequiredMixin,
+                     ConditionalGetMixin, KeysetPaginationMixin, FilterView):
     model = Task
     template_name = 'tasks/list.html'
     context_object_name = 'tasks'
     filterset_class = TaskFilterSet
+    ordering = ('created', 'id')
+
+    def get_queryset(self):
+        return super().get_queryset().with_related()
+
+    def get_keyset_ordering(self):
+        if 'search_rank' in self.object_list.query.annotations:
+            return ('-search_rank', 'id')
+        return self.ordering
+
+    def get_etag_parts(self):
+        filterset = self.get_filterset(self.get_filterset_class())
+        if filterset.is_bound and not filterset.is_valid():
+            return [filterset.errors]
+        return [
+            *filterset.qs.order_by().aggregate(Max('updated'), Count('id')).values(),
+            *get_versions(Status, Label, get_user_model()),
+        ]
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        language = get_language()
+        context['task_rows'] = render_cached_fragments(
+            'tasks/row.html',
+            context['tasks'],
+            lambda task: 'task_row:{}:{}:{}:{}'.format(
+                task.pk, task.updated.timestamp(), language,
+                hashlib.md5(repr(
+                    [str(task.status), str(task.creator), str(task.executor or '')]
+                ).encode()).hexdigest(),
+            ),
+            'task',
+        )
+        context['bulk_form'] = TaskBulkActionForm()
+        return context
+
+
+class TaskBulkActionView(CustomLoginRequiredMixin, FormView):
+    http_method_names = ['post']
+    form_class = TaskBulkActionForm
+
+    def get_success_url(self):
+        url = self.request.POST.get('next')
+        if url and url_has_allowed_host_and_scheme(
+                url, self.request.get_host(), self.request.is_secure()):
+            return url
+        return reverse('tasks_list')
+
+    def form_invalid(self, form):
+        for errors in form.errors.values():
+            messages.error(self.request, ' '.join(errors))
+        return redirect(self.get_success_url())
+
+    def form_valid(self, form):
+        action = form.cleaned_data['action']
+        tasks = form.cleaned_data['tasks']
+        if action == 'delete':
+            return self.delete(tasks)
+        count = apply_action(action, tasks, form.get_value(), self.request.user)
+        messages.success(self.request, _('Tasks changed: %(count)d') % {'count': count})
+        return redirect(self.get_success_url())
+
+    def delete(self, tasks):
+        count = apply_action('delete', tasks, author=self.request.user)
+        if count != len(tasks):
+            messages.error(self.request, _('Only the author of the task can delete it'))
+        messages.success(self.request, _('Tasks deleted: %(count)d') % {'count': count})
+        return redirect(self.get_success_url())
+
+
+class TaskApiView(LoginRequiredMixin, KeysetPaginationMixin, View):
+    raise_exception = True
+    ordering = ('created', 'id')
+    paginate_by = 100
+    max_paginate_by = 1000
+    chunk_size = 2000
+
+    def get(self, request, *args, **kwargs):
+        try:
+            fields = parse_fields(request.GET.get('fields'))
+        except InvalidFields:
+            return JsonResponse({'errors': {'fields': [_('Unknown fields')]}},
+                                status=400)
+        filterset = TaskFilterSet(request.GET, queryset=Task.objects.all(),
+                                  request=request)
+        if not filterset.is_valid():
+            return JsonResponse({'errors': filterset.errors}, status=400)
+
+        queryset = filterset.qs.values(*get_columns(fields, self.ordering))
+        if request.GET.get('stream'):
+            return self.stream(queryset, fields)
+        return self.paginate(queryset, fields)
+
+    def get_ordering(self):
+        return self.ordering
+
+    def get_paginate_by(self):
+        try:
+            paginate_by = int(self.request.GET.get('page_size', self.paginate_by))
+        except ValueError:
+            paginate_by = self.paginate_by
+        return max(1, min(paginate_by, self.max_paginate_by))
+
+    def get_page_url(self, cursor):
+        if not cursor:
+            return None
+        return self.request.build_absolute_uri(
+            f'{self.request.path}?{self.get_page_query(cursor)}'
+        )
+
+    def paginate(self, queryset, fields):
+        _paginator, page, rows, _is_paginated = self.paginate_queryset(
+            queryset, self.get_paginate_by()
+        )
+        return JsonResponse({
+            'results': to_records(rows, fields),
+            'next': self.get_page_url(page.next_cursor),
+            'previous': self.get_page_url(page.previous_cursor),
+        })
 
+    def stream(self, queryset, fields):
+        rows = queryset.order_by(*self.ordering).iterator(chunk_size=self.chunk_size)
+        return StreamingHttpResponse(self.stream_json(rows, fields),
+                                     content_type='application/json')
 
-class TaskDetailView(CustomLoginRequiredMixin, DetailView):
+    def stream_json(self, rows, fields):
+        yield '{"results": ['
+        separator = ''
+        for chunk in iter_chunks(rows, self.chunk_size):
+            yield separator + ','.join(
+                json.dumps(record, cls=DjangoJSONEncoder)
+                for record in to_records(chunk, fields)
+            )
+            separator = ','
+        yield ']}'
+
+
+class TaskExportView(CustomLoginRequiredMixin, View):
+    ordering = ('created', 'id')
+    chunk_size = 2000
+    columns = {
+        'id': gettext_lazy('ID'),
+        'name': gettext_lazy('Name'),
+        'description': gettext_lazy('Description'),
+        'status': gettext_lazy('Status'),
+        'creator': gettext_lazy('Author'),
+        'executor': gettext_lazy('Executor'),
+        'labels': gettext_lazy('Labels'),
+        'created': gettext_lazy('Created date'),
+    }
+
+    def get(self, request, *args, **kwargs):
+        filterset = TaskFilterSet(request.GET, queryset=Task.objects.all(),
+                                  request=request)
+        if not filterset.is_valid():
+            return redirect(f"{reverse('tasks_list')}?{request.GET.urlencode()}")
+
+        fields = list(self.columns)
+        rows = filterset.qs.order_by(*self.ordering) \
+            .values(*get_columns(fields)).iterator(chunk_size=self.chunk_size)
+        response = StreamingHttpResponse(
+            iter_csv(rows, fields, [str(self.columns[field]) for field in fields],
+                     self.chunk_size),
+            content_type='text/csv; charset=utf-8',
+        )
+        filename = timezone.localdate().strftime('tasks-%Y-%m-%d.csv')
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
+
+
+class TaskDetailView(AsyncViewMixin, ReplicaReadMixin, CustomLoginRequiredMixin,
+                     ConditionalGetMixin, DetailView):
     model = Task
     template_name = 'tasks/detail.html'
 
+    def get_queryset(self):
+        return Task.objects.with_related()
+
+    @cached_property
+    def state(self):
+        updated = Task.objects.filter(pk=self.kwargs['pk']) \
+            .values_list('updated', flat=True).first()
+        return [updated, *get_versions(Status, Label, get_user_model())]
+
+    def get_etag_parts(self):
+        return self.state
+
+    def render_card(self):
+        self.object = self.get_object()
+        return render_to_string('tasks/card.html', {
+            'task': self.object,
+            'changes': get_history(self.object),
+        })
+
+    def get_card(self):
+        if not settings.VERSIONED_CACHE:
+            return self.render_card()
+        # The card and its history change only with the task row or with
+        # statuses, labels and users, the task is not loaded on a cache hit.
+        updated, *versions = self.state
+        if updated is None:
+            raise Http404
+        key = 'task_card:{}:{}:{}:{}:{}:{}'.format(
+            self.kwargs['pk'], updated.timestamp(), get_language(), *versions
+        )
+        return cache.get_or_set(key, self.render_card, get_timeout(FRAGMENT_TIMEOUT))
+
+    def get(self, request, *args, **kwargs):
+        return self.render_to_response({'card': mark_safe(self.get_card())})
+
 
 class TaskCreateView(CustomLoginRequiredMixin, SuccessMessageMixin, CreateView):
     model = Task
@@ -43,6 +277,24 @@ class TaskUpdateView(CustomLoginRequiredMixin, SuccessMessageMixin, UpdateView):
     success_url = reverse_lazy('tasks_list')
     success_message = _('The task has been successfully changed')
 
+    def get_queryset(self):
+        return Task.objects.with_related()
+
+    def get_object(self, queryset=None):
+        task = super().get_object(queryset)
+        self.snapshot = get_snapshot(task)
+        return task
+
+    def form_valid(self, form):
+        with transaction.atomic():
+            response = super().form_valid(form)
+            record_changes(
+                diff_snapshots(self.object.pk, self.snapshot,
+                               get_snapshot(self.object)),
+                self.request.user,
+            )
+        return response
+
 
 class TaskDeleteView(CustomLoginRequiredMixin, SuccessMessageMixin, DeleteView):
     model = Task
@@ -67,3 +319,9 @@ class TaskDeleteView(CustomLoginRequiredMixin, SuccessMessageMixin, DeleteView):
         if not self.check_task_creator():
             return redirect('tasks_list')
         return super().post(request, *args, **kwargs)
+
+    def form_valid(self, form):
+        with transaction.atomic():
+            record_changes([(self.object.pk, 'deleted', self.object.name, '')],
+                           self.request.user)
+            return super().form_valid(form)
@@ -0,0 +1,25 @@
+from django.forms import Select
+
+
+class AutocompleteSelect(Select):
+    def __init__(self, url, attrs=None):
+        super().__init__(attrs)
+        self.url = url
+
+    def get_context(self, name, value, attrs):
+        context = super().get_context(name, value, attrs)
+        context['widget']['attrs']['data-autocomplete-url'] = str(self.url)
+        return context
+
+    def optgroups(self, name, value, attrs=None):
+        iterator = self.choices
+        field = iterator.field
+        selected = [v for v in value if str(v).isdigit()]
+        self.choices = [('', field.empty_label)] + [
+            (obj.pk, field.label_from_instance(obj))
+            for obj in iterator.queryset.filter(pk__in=selected)
+        ]
+        try:
+            return super().optgroups(name, value, attrs)
+        finally:
+            self.choices = iterator
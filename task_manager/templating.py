@@ -0,0 +1,40 @@
+from pathlib import Path
+
+import django
+from django.apps import apps
+from django.forms.renderers import get_default_renderer
+from django.template import engines
+
+WARMUP_APPS = ['django_bootstrap5']
+FORM_TEMPLATES_DIR = Path(django.__file__).parent / 'forms' / 'templates'
+
+
+def iter_template_names(directory):
+    directory = Path(directory)
+    for path in sorted(directory.rglob('*.html')):
+        yield path.relative_to(directory).as_posix()
+
+
+def get_template_dirs(engine):
+    return list(engine.dirs) + [
+        Path(apps.get_app_config(label).path) / 'templates' for label in WARMUP_APPS
+    ]
+
+
+def warm_templates():
+    # Cached loaders keep compiled templates for the life of the process,
+    # compiling them at boot spares the first requests of every worker.
+    engine = engines['django'].engine
+    names = sorted({
+        name for directory in get_template_dirs(engine)
+        for name in iter_template_names(directory)
+    })
+    for name in names:
+        engine.get_template(name)
+
+    # Widgets are rendered by the form renderer, which has its own engine.
+    renderer = get_default_renderer()
+    form_names = list(iter_template_names(FORM_TEMPLATES_DIR))
+    for name in form_names:
+        renderer.get_template(name)
+    return len(names) + len(form_names)
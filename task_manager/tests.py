@@ -1,7 +1,29 @@
+import os
+import re
+from unittest.mock import patch
+
+from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.test import TestCase
+from django.core.cache import cache
+from django.core.cache.utils import make_template_fragment_key
+from django.db import connection, connections, transaction
+from django.db.models import Sum
+from django.template import engines
+from asgiref.sync import iscoroutinefunction
+from django.test import AsyncRequestFactory, Client, TestCase, \
+    TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
+from task_manager.benchmark import get_cases, get_regressions, measure
+from task_manager.performance import Metrics, RequestStats
+from task_manager.replicas import PIN_COOKIE, REPLICA_DB_ALIAS, ReplicaRouter
+from task_manager.statuses.models import Status
+from task_manager.statuses.views import StatusListView
+from task_manager.tasks.models import Task
+from task_manager.tasks.seed import seed_data
+from task_manager.templating import warm_templates
+
 
 class SetUpLoggedUserMixin:
     @classmethod
@@ -14,10 +36,45 @@ class SetUpLoggedUserMixin:
         )
 
     def setUp(self):
+        cache.clear()
         self.client.login(username=self.logged_user.username,
                           password=self.logged_user_data['password'])
 
 
+class QueryCountMixin:
+    def get_query_count(self, url, data=None):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url, data)
+        self.assertEqual(response.status_code, 200)
+        return len(context)
+
+    def assertConstantQueryCount(self, url, add_rows, data=None):
+        cache.clear()
+        expected = self.get_query_count(url, data)
+        add_rows()
+        cache.clear()
+        self.assertEqual(self.get_query_count(url, data), expected,
+                         'Query count should not depend on the number of rows')
+
+
+class ConditionalGetTestMixin:
+    def get_etag(self, url):
+        # The first response sets the CSRF cookie the ETag depends on.
+        self.client.get(url)
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return response['ETag']
+
+    def get_with_etag(self, url, etag):
+        return self.client.get(url, headers={'If-None-Match': etag})
+
+    def assertNotModified(self, url, etag):
+        self.assertEqual(self.get_with_etag(url, etag).status_code, 304)
+
+    def assertModified(self, url, etag):
+        self.assertEqual(self.get_with_etag(url, etag).status_code, 200)
+
+
 class TestIndexTemplateView(SetUpLoggedUserMixin, TestCase):
     @classmethod
     def setUpTestData(cls):
@@ -32,6 +89,19 @@ class TestIndexTemplateView(SetUpLoggedUserMixin, TestCase):
         response = self.client.get(self.url)
         self.assertEqual(response.status_code, 200)
 
+    def test_index_dashboard(self):
+        status = Status.objects.create(name='Dashboard status')
+        seed_data(tasks=20, users=3, labels=2, statuses=2, prefix='dashboard')
+        Task.objects.create(name='Own task', status=status, creator=self.logged_user,
+                            executor=self.logged_user)
+        with self.assertNumQueries(5):
+            response = self.client.get(self.url)
+        dashboard = response.context['dashboard']
+        self.assertEqual(dashboard['total'], 21)
+        self.assertIn((status.pk, status.name, 1), dashboard['statuses'])
+        self.assertIn((self.logged_user, 1), dashboard['executors'])
+        self.assertEqual(sum(count for _user, count in dashboard['executors']), 21)
+
 
 class TestUserLoginView(SetUpLoggedUserMixin, TestCase):
     @classmethod
@@ -69,3 +139,213 @@ class TestNotFoundedPage(TestCase):
     def test_not_founded_page(self):
         response = self.client.get('/not-founded-page/')
         self.assertEqual(response.status_code, 404)
+
+
+@override_settings(SERVER_TIMING=True)
+class TestPerformanceMiddleware(SetUpLoggedUserMixin, TestCase):
+    def test_server_timing(self):
+        response = self.client.get(reverse('statuses_list'))
+        self.assertRegex(
+            response['Server-Timing'],
+            r'^app;dur=[\d.]+, db;dur=[\d.]+;desc="\d+ queries", tpl;dur=[\d.]+$'
+        )
+
+    @override_settings(METRICS_TOKEN='secret')
+    def test_metrics(self):
+        self.client.get(reverse('statuses_list'))
+        content = self.client.get(
+            reverse('metrics'), headers={'Authorization': 'Bearer secret'}
+        ).content.decode()
+        labels = f'pid="{os.getpid()}",view="statuses_list",method="GET"'
+        self.assertIn(f'taskmanager_requests_total{{{labels},status="200"}} ', content)
+        self.assertIn(f'taskmanager_request_duration_seconds_count{{{labels}}} ', content)
+        self.assertIn(f'taskmanager_request_duration_seconds_bucket{{{labels},le="+Inf"}} ',
+                      content)
+
+        response = self.client.get(reverse('metrics'),
+                                   headers={'Authorization': 'Bearer wrong'})
+        self.assertEqual(response.status_code, 404)
+
+    def test_metrics_sum_processes(self):
+        metrics = Metrics()
+        metrics.per_process = False
+        stats = RequestStats()
+        stats.queries = 3
+        for duration in (0.02, 0.3):
+            metrics.observe('tasks_list', 'GET', 200, duration, stats, 100, False)
+        content = metrics.render()
+        self.assertIn('taskmanager_requests_total'
+                      '{view="tasks_list",method="GET",status="200"} 2\n', content)
+        self.assertIn('taskmanager_db_queries_total{view="tasks_list",method="GET"} 6\n',
+                      content)
+        self.assertIn('taskmanager_request_duration_seconds_bucket'
+                      '{view="tasks_list",method="GET",le="0.25"} 1\n', content)
+        self.assertIn('taskmanager_request_duration_seconds_bucket'
+                      '{view="tasks_list",method="GET",le="0.5"} 2\n', content)
+
+    def test_metrics_disabled_without_token(self):
+        response = self.client.get(reverse('metrics'),
+                                   headers={'Authorization': 'Bearer '})
+        self.assertEqual(response.status_code, 404)
+
+    @override_settings(QUERY_BUDGET=0)
+    def test_query_budget(self):
+        with self.assertLogs('task_manager.performance', 'WARNING') as logs:
+            self.client.get(reverse('statuses_list'))
+        self.assertIn('Query budget exceeded: statuses_list', logs.output[0])
+
+
+class TestBenchmark(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.users = seed_data(tasks=30, users=5, labels=3, statuses=2, prefix='bench')
+
+    def test_seed_data_is_deterministic(self):
+        task = Task.objects.order_by('pk').first()
+        self.assertEqual(Task.objects.count(), 30)
+        self.assertEqual(Status.objects.aggregate(total=Sum('task_count'))['total'], 30)
+        with transaction.atomic():
+            seed_data(tasks=30, users=5, labels=3, statuses=2, prefix='again')
+            again = Task.objects.filter(name__startswith='again').order_by('pk').first()
+            transaction.set_rollback(True)
+        self.assertEqual(again.name.split()[1:], task.name.split()[1:])
+        self.assertEqual(again.description, task.description)
+
+    def test_every_page_is_measured(self):
+        self.client.force_login(self.users[0])
+        names = []
+        for name, url in get_cases(self.users[0]):
+            result = measure(self.client, url, repeat=2)
+            self.assertIn(result['status'], (200, 302), name)
+            names.append(name)
+        self.assertIn('task_update', names)
+        self.assertNotIn('logout', names)
+        self.assertNotIn('tasks_bulk', names)
+
+    def test_regressions(self):
+        base = {'queries': 5, 'p50_ms': 10, 'p95_ms': 20, 'peak_kib': 100}
+        self.assertEqual(get_regressions({'page': base}, {'page': base}, 0.25), [])
+        self.assertEqual(get_regressions({'page': {**base, 'queries': 6}},
+                                         {'page': base}, 0.25),
+                         ['page: 6 queries, baseline 5'])
+        self.assertEqual(len(get_regressions({'page': {**base, 'p95_ms': 100}},
+                                             {'page': base}, 0.25)), 1)
+
+
+@override_settings(ASYNC_VIEWS=True, SERVER_TIMING=True)
+class TestAsyncViews(TransactionTestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create(username='async_user')
+        Status.objects.create(name='Async status')
+
+    async def test_async_view_runs_on_thread_pool(self):
+        view = StatusListView.as_view()
+        self.assertTrue(iscoroutinefunction(view))
+        request = AsyncRequestFactory().get(reverse('statuses_list'))
+        request.user = self.user
+        response = await view(request)
+        self.assertTrue(response.is_rendered)
+        self.assertContains(response, 'Async status')
+
+    async def test_middleware_counts_queries_under_asgi(self):
+        await self.async_client.aforce_login(self.user)
+        response = await self.async_client.get(reverse('statuses_list'))
+        self.assertEqual(response.status_code, 200)
+        self.assertRegex(response['Server-Timing'], r'desc="[1-9]\d* queries"')
+
+
+@override_settings(REPLICA_PIN_SECONDS=60)
+class TestReplicaRouting(SetUpLoggedUserMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        # The replica alias shares the test connection, objects still record
+        # which alias they were read from.
+        replica_settings = patch.dict(
+            connections.settings, {REPLICA_DB_ALIAS: connections.settings['default']}
+        )
+        replica_settings.start()
+        self.addCleanup(replica_settings.stop)
+        connections[REPLICA_DB_ALIAS] = connections['default']
+        self.addCleanup(connections.__delitem__, REPLICA_DB_ALIAS)
+
+        Status.objects.create(name='Replica status')
+
+    def get_read_alias(self):
+        response = self.client.get(reverse('statuses_list'))
+        return response.context['statuses'][0]._state.db
+
+    def test_reads_from_replica(self):
+        self.assertEqual(self.get_read_alias(), REPLICA_DB_ALIAS)
+
+    def test_pinned_to_primary_after_write(self):
+        response = self.client.post(reverse('status_create'), {'name': 'New status'})
+        self.assertIn(PIN_COOKIE, response.cookies)
+        self.assertEqual(self.get_read_alias(), 'default')
+
+    @override_settings(VERSIONED_CACHE=True)
+    def test_replica_reads_skip_etags(self):
+        response = self.client.get(reverse('statuses_list'))
+        self.assertNotIn('ETag', response)
+
+    def test_router(self):
+        router = ReplicaRouter()
+        self.assertEqual(router.db_for_read(Task), 'default')
+        self.assertEqual(router.db_for_write(Task), 'default')
+        self.assertFalse(router.allow_migrate(REPLICA_DB_ALIAS, 'tasks'))
+
+
+class TestSessionModes(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(username='ada_lovelace')
+
+    def count_session_queries(self, mode):
+        # A new client, because the session middleware keeps its engine.
+        client = Client()
+        with override_settings(SESSION_ENGINE=settings.SESSION_ENGINES[mode]):
+            client.force_login(self.user)
+            with CaptureQueriesContext(connection) as context:
+                for _ in range(3):
+                    client.get(reverse('statuses_list'))
+        return len([query for query in context if 'django_session' in query['sql']])
+
+    def test_session_queries_per_request(self):
+        self.assertEqual(self.count_session_queries('db'), 3)
+        for mode in ('cached_db', 'cache', 'signed_cookies'):
+            self.assertEqual(self.count_session_queries(mode), 0, mode)
+
+
+class TestTemplateWarmup(SetUpLoggedUserMixin, TestCase):
+    def test_pages_render_from_warmed_templates(self):
+        loader = engines['django'].engine.template_loaders[0]
+        loader.reset()
+        self.assertGreater(warm_templates(), 30)
+        self.assertIn('includes/nav.html', loader.get_template_cache)
+        # Without source loaders every template must come from the cache.
+        with patch.object(loader, 'loaders', []):
+            response = self.client.get(reverse('tasks_list'))
+        self.assertEqual(response.status_code, 200)
+
+
+class TestLayoutCache(SetUpLoggedUserMixin, TestCase):
+    def get_logout_token(self, client):
+        response = client.get(reverse('index'))
+        return re.search(r'name="csrfmiddlewaretoken" value="([^"]+)"',
+                         response.content.decode()).group(1)
+
+    def test_nav_is_cached_per_variant(self):
+        response = self.client.get(reverse('index'))
+        key = make_template_fragment_key(
+            'nav', [response.wsgi_request.LANGUAGE_CODE, True]
+        )
+        self.assertIsNotNone(cache.get(key))
+        self.client.logout()
+        response = self.client.get(reverse('index'))
+        self.assertContains(response, reverse('login'))
+        self.assertNotContains(response, reverse('logout'))
+
+    def test_csrf_token_is_rendered_per_request(self):
+        other_client = Client()
+        other_client.force_login(self.logged_user)
+        self.assertNotEqual(self.get_logout_token(self.client),
+                            self.get_logout_token(other_client))
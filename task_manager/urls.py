@@ -1,13 +1,15 @@
 from django.contrib import admin
 from django.urls import path, include
 
-from task_manager.views import IndexTemplateView, UserLoginView, UserLogoutView
+from task_manager.views import IndexTemplateView, UserLoginView, \
+    UserLogoutView, MetricsView
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('', IndexTemplateView.as_view(), name='index'),
     path('login/', UserLoginView.as_view(), name='login'),
     path('logout/', UserLogoutView.as_view(), name='logout'),
+    path('metrics/', MetricsView.as_view(), name='metrics'),
     path('users/', include('task_manager.users.urls')),
     path('statuses/', include('task_manager.statuses.urls')),
     path('tasks/', include('task_manager.tasks.urls')),
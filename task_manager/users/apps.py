@@ -1,8 +1,14 @@
 from django.apps import AppConfig
+from django.contrib.auth import get_user_model
 from django.utils.translation import gettext_lazy as _
 
+from task_manager.cache import track_versions
+
 
 class UsersConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'task_manager.users'
     verbose_name = _('Users')
+
+    def ready(self):
+        track_versions(get_user_model(), ignored_fields=['last_login'])
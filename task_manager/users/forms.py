@@ -1,19 +1,8 @@
 from django.contrib.auth import get_user_model
 from django.contrib.auth.forms import UserCreationForm
-
-
-def clean_username(self):
-    username = self.cleaned_data.get('username')
-    if self._meta.model.objects.exclude(pk=self.instance.pk). \
-            filter(username__iexact=username).exists():
-        self.add_error(
-            'username',
-            self.instance.unique_error_message(
-                self._meta.model, ['username']
-            )
-        )
-
-    return username
+from django.core.exceptions import ValidationError
+from django.db.models import Value
+from django.db.models.functions import Lower
 
 
 class CustomUserCreationForm(UserCreationForm):
@@ -24,3 +13,29 @@ class CustomUserCreationForm(UserCreationForm):
             'last_name',
             'username',
         ]
+
+    def clean_username(self):
+        username = self.cleaned_data.get('username')
+        if username and self._meta.model.objects.exclude(pk=self.instance.pk) \
+                .alias(username_lower=Lower('username')) \
+                .filter(username_lower=Lower(Value(username))).exists():
+            self.add_username_error()
+        return username
+
+    def add_username_error(self):
+        self.add_error(
+            'username',
+            self.instance.unique_error_message(
+                self._meta.model, ['username']
+            )
+        )
+
+    def validate_unique(self):
+        # Case-insensitive uniqueness of username is checked in clean_username
+        # and enforced by the Lower(username) unique index.
+        exclude = self._get_validation_exclusions()
+        exclude.add('username')
+        try:
+            self.instance.validate_unique(exclude=exclude)
+        except ValidationError as e:
+            self._update_errors(e)
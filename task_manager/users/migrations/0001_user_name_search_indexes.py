@@ -0,0 +1,41 @@
+from django.db import migrations, models
+from django.db.models.functions import Upper
+
+SEARCH_FIELDS = ['username', 'first_name', 'last_name']
+
+
+def get_indexes():
+    return [
+        models.Index(
+            models.OpClass(Upper(field), name='text_pattern_ops'),
+            name=f'user_{field}_prefix_idx',
+        )
+        for field in SEARCH_FIELDS
+    ]
+
+
+def add_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    user = apps.get_model('auth', 'User')
+    for index in get_indexes():
+        schema_editor.add_index(user, index)
+
+
+def remove_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    user = apps.get_model('auth', 'User')
+    for index in get_indexes():
+        schema_editor.remove_index(user, index)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+    ]
+
+    operations = [
+        migrations.RunPython(add_indexes, remove_indexes),
+    ]
@@ -0,0 +1,39 @@
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import Lower
+
+CONSTRAINT = models.UniqueConstraint(
+    Lower('username'), name='user_username_lower_uniq'
+)
+
+
+def check_duplicates(apps, schema_editor):
+    duplicates = apps.get_model('auth', 'User').objects \
+        .values(username_lower=Lower('username')) \
+        .annotate(count=Count('id')).filter(count__gt=1) \
+        .values_list('username_lower', flat=True)
+    if duplicates:
+        raise ValueError(
+            'Usernames must be unique regardless of case, rename the users '
+            'with these usernames before migrating: ' + ', '.join(sorted(duplicates))
+        )
+
+
+def add_constraint(apps, schema_editor):
+    schema_editor.add_constraint(apps.get_model('auth', 'User'), CONSTRAINT)
+
+
+def remove_constraint(apps, schema_editor):
+    schema_editor.remove_constraint(apps.get_model('auth', 'User'), CONSTRAINT)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0001_user_name_search_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(check_duplicates, migrations.RunPython.noop),
+        migrations.RunPython(add_constraint, remove_constraint),
+    ]
@@ -1,5 +1,7 @@
 from django.contrib.auth import get_user_model
 
+USERNAME_LOWER_CONSTRAINT = 'user_username_lower_uniq'
+
 
 def get_full_name(self):
     return f'{self.first_name} {self.last_name}'
@@ -1,12 +1,20 @@
+from importlib import import_module
+from unittest.mock import patch
+
+from django.apps import apps
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.core.exceptions import ObjectDoesNotExist
+from django.db import IntegrityError, connection
 from django.shortcuts import reverse
-from django.test import TestCase
+from django.test import TestCase, override_settings
 
 from task_manager.statuses.models import Status
 from task_manager.tasks.models import Task
 from task_manager.tests import SetUpLoggedUserMixin
+from task_manager.users.forms import CustomUserCreationForm
+from task_manager.users.models import USERNAME_LOWER_CONSTRAINT
+from task_manager.users.views import UserListView
 
 
 class TestUserListView(SetUpLoggedUserMixin, TestCase):
@@ -25,6 +33,59 @@ class TestUserListView(SetUpLoggedUserMixin, TestCase):
         self.assertEqual(response.status_code, 200)
 
 
+@patch.object(UserListView, 'paginate_by', 2)
+class TestUserListViewPaginationAndSearch(SetUpLoggedUserMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.url = reverse('user_list')
+        for username in ['isaac_newton', 'marie_curie', 'niels_bohr']:
+            get_user_model().objects.create(username=username)
+
+    def test_user_list_view_pages(self):
+        response = self.client.get(self.url)
+        page = response.context['page_obj']
+        self.assertEqual(len(page), 2)
+        self.assertTrue(page.has_next())
+
+        response = self.client.get(f'{self.url}?{page.next_query}')
+        self.assertEqual(
+            [user.username for user in response.context['users']],
+            ['marie_curie', 'niels_bohr']
+        )
+
+    def test_user_list_view_search(self):
+        response = self.client.get(self.url, {'q': 'MARIE'})
+        self.assertEqual(
+            [user.username for user in response.context['users']],
+            ['marie_curie']
+        )
+
+    def test_user_list_view_search_full_name(self):
+        get_user_model().objects.create(username='picasso', first_name='Pablo',
+                                        last_name='Picasso')
+        get_user_model().objects.create(username='neruda', first_name='Pablo',
+                                        last_name='Neruda')
+        for term in ['Pablo Picasso', 'picasso pab', 'PAB PIC']:
+            response = self.client.get(self.url, {'q': term})
+            self.assertEqual(
+                [user.username for user in response.context['users']],
+                ['picasso'], term
+            )
+
+    @override_settings(VERSIONED_CACHE=True)
+    def test_user_list_view_cached_for_anonymous(self):
+        self.client.logout()
+        self.client.get(self.url)
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url, {'utm_source': 'mail'})
+        self.assertContains(response, 'isaac_newton')
+
+        self.assertNotContains(self.client.get(self.url, {'q': 'ada'}), 'ada_lovelace')
+        get_user_model().objects.create(username='ada_lovelace')
+        self.assertContains(self.client.get(self.url, {'q': 'ada'}), 'ada_lovelace')
+
+
 class TestUserCreate(TestCase):
     @classmethod
     def setUpTestData(cls):
@@ -48,6 +109,50 @@ class TestUserCreate(TestCase):
             username=self.data_to_create_user['username']).exists())
 
 
+class TestUserCreateCaseInsensitiveUsername(SetUpLoggedUserMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.url = reverse('user_create')
+        cls.data_to_create_user = {
+            'username': 'Albert_Einstein',
+            'password1': 'qwer1234qwer1234',
+            'password2': 'qwer1234qwer1234'
+        }
+
+    def test_user_create_post_username_in_other_case(self):
+        with self.assertNumQueries(1):
+            form = CustomUserCreationForm(self.data_to_create_user)
+            self.assertFalse(form.is_valid())
+        self.assertIn('username', form.errors)
+
+    def test_user_create_post_concurrent_duplicate(self):
+        with patch.object(CustomUserCreationForm, 'clean_username',
+                          lambda form: form.cleaned_data['username']):
+            response = self.client.post(self.url, self.data_to_create_user)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('username', response.context['form'].errors)
+        self.assertEqual(get_user_model().objects.count(), 1)
+
+    def test_user_create_post_other_integrity_error(self):
+        with patch.object(CustomUserCreationForm, 'save',
+                          side_effect=IntegrityError('NOT NULL constraint failed')):
+            with self.assertRaises(IntegrityError):
+                self.client.post(self.url, {**self.data_to_create_user,
+                                            'username': 'isaac_newton'})
+
+    def test_migration_reports_duplicates(self):
+        migration = import_module(
+            'task_manager.users.migrations.0002_user_username_lower_unique'
+        )
+        migration.check_duplicates(apps, None)
+        with connection.cursor() as cursor:
+            cursor.execute(f'DROP INDEX {USERNAME_LOWER_CONSTRAINT}')
+        get_user_model().objects.create(username='ALBERT_einstein')
+        with self.assertRaisesMessage(ValueError, 'albert_einstein'):
+            migration.check_duplicates(apps, None)
+
+
 class TestUserUpdate(SetUpLoggedUserMixin, TestCase):
     @classmethod
     def setUpTestData(cls):
@@ -84,6 +189,11 @@ class TestUserUpdate(SetUpLoggedUserMixin, TestCase):
         self.assertEqual(self.logged_user.first_name, self.user_data_to_update['first_name'])
         self.assertEqual(self.logged_user.last_name, self.user_data_to_update['last_name'])
 
+    def test_user_update_view_post_self_user_same_username(self):
+        self.user_data_to_update['username'] = self.logged_user.username
+        response = self.client.post(self.url_self, self.user_data_to_update)
+        self.assertRedirects(response, reverse('user_list'))
+
     def test_user_update_view_post_other_user(self):
         self.user_data_to_update['username'] = 'try_to_update_username'
         response = self.client.post(self.url_other, self.user_data_to_update)
@@ -1,8 +1,11 @@
 from django.urls import path
-from .views import UserListView, UserDeleteView, UserCreateView, UserUpdateView
+from .views import UserListView, UserDeleteView, UserCreateView, \
+    UserUpdateView, UserAutocompleteView
 
 urlpatterns = [
     path('', UserListView.as_view(), name='user_list'),
+    path('autocomplete/', UserAutocompleteView.as_view(),
+         name='user_autocomplete'),
     path('create/', UserCreateView.as_view(), name='user_create'),
     path('<int:pk>/update/', UserUpdateView.as_view(), name='user_update'),
     path('<int:pk>/delete/', UserDeleteView.as_view(), name='user_delete'),
@@ -2,13 +2,20 @@ from django.contrib import messages
 from django.contrib.auth import get_user_model
 from django.contrib.auth.mixins import UserPassesTestMixin
 from django.contrib.messages.views import SuccessMessageMixin
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.http import JsonResponse
 from django.shortcuts import redirect
 from django.urls import reverse_lazy
 from django.utils.translation import gettext as _
-from django.views.generic import ListView, DeleteView, CreateView, UpdateView
+from django.views.generic import ListView, DeleteView, CreateView, UpdateView, \
+    View
 
-from task_manager.mixins import CustomLoginRequiredMixin
+from task_manager.mixins import CustomLoginRequiredMixin, \
+    AnonymousCachePageMixin, ReplicaReadMixin
+from task_manager.pagination import KeysetPaginationMixin
 from task_manager.users.forms import CustomUserCreationForm
+from task_manager.users.models import USERNAME_LOWER_CONSTRAINT
 
 
 class LoginRequiredAndUserSelfCheckMixin(CustomLoginRequiredMixin, UserPassesTestMixin):
@@ -25,21 +32,72 @@ class LoginRequiredAndUserSelfCheckMixin(CustomLoginRequiredMixin, UserPassesTes
             return redirect('user_list')
 
 
-class UserListView(ListView):
+def filter_by_name(queryset, term):
+    # Every word has to start one of the names, so "Pablo Picasso" matches
+    # both columns and each prefix can still use its UPPER() index.
+    for word in term.split():
+        queryset = queryset.filter(Q(
+            username__istartswith=word,
+            first_name__istartswith=word,
+            last_name__istartswith=word,
+            _connector=Q.OR,
+        ))
+    return queryset
+
+
+class UniqueUsernameMixin:
+    def form_valid(self, form):
+        try:
+            with transaction.atomic():
+                return super().form_valid(form)
+        except IntegrityError as error:
+            if USERNAME_LOWER_CONSTRAINT not in str(error):
+                raise
+            form.add_username_error()
+            return self.form_invalid(form)
+
+
+class UserListView(ReplicaReadMixin, AnonymousCachePageMixin, KeysetPaginationMixin,
+                   ListView):
     model = get_user_model()
     template_name = 'users/list.html'
     context_object_name = 'users'
+    ordering = ('id',)
+    page_cache_models = (get_user_model(),)
+    page_cache_params = ('q', 'cursor')
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        term = self.request.GET.get('q', '').strip()
+        if term:
+            queryset = filter_by_name(queryset, term)
+        return queryset
+
+
+class UserAutocompleteView(CustomLoginRequiredMixin, View):
+    limit = 20
+
+    def get(self, request, *args, **kwargs):
+        term = request.GET.get('q', '').strip()
+        users = get_user_model().objects.only('id', 'first_name', 'last_name')
+        if term:
+            users = filter_by_name(users, term)
+        results = [
+            {'id': user.pk, 'text': str(user)}
+            for user in users.order_by('id')[:self.limit]
+        ]
+        return JsonResponse({'results': results})
 
 
-class UserCreateView(SuccessMessageMixin, CreateView):
+class UserCreateView(UniqueUsernameMixin, SuccessMessageMixin, CreateView):
     template_name = 'users/create.html'
     form_class = CustomUserCreationForm
     success_url = reverse_lazy('login')
     success_message = _('The user has been successfully registered')
 
 
-class UserUpdateView(LoginRequiredAndUserSelfCheckMixin, SuccessMessageMixin,
-                     UpdateView):
+class UserUpdateView(LoginRequiredAndUserSelfCheckMixin, UniqueUsernameMixin,
+                     SuccessMessageMixin, UpdateView):
     model = get_user_model()
     form_class = CustomUserCreationForm
     template_name = 'users/update.html'
@@ -1,14 +1,26 @@
 from django.contrib import messages
 from django.contrib.auth.views import LoginView, LogoutView
 from django.contrib.messages.views import SuccessMessageMixin
+from django.conf import settings
+from django.utils.crypto import constant_time_compare
+from django.http import Http404, HttpResponse
 from django.urls import reverse_lazy
 from django.utils.translation import gettext as _
-from django.views.generic import TemplateView
+from django.views.generic import TemplateView, View
+
+from task_manager.performance import metrics
+from task_manager.tasks.dashboard import get_dashboard
 
 
 class IndexTemplateView(TemplateView):
     template_name = 'index.html'
 
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        if self.request.user.is_authenticated:
+            context['dashboard'] = get_dashboard()
+        return context
+
 
 class UserLoginView(SuccessMessageMixin, LoginView):
     template_name = 'users/login.html'
@@ -22,3 +34,15 @@ class UserLogoutView(SuccessMessageMixin, LogoutView):
     def dispatch(self, request, *args, **kwargs):
         messages.info(request, _('You are logged out'))
         return super().dispatch(request, *args, **kwargs)
+
+
+class MetricsView(View):
+    def get(self, request, *args, **kwargs):
+        # Behind a proxy every request has the proxy's address, so the
+        # scraper has to present the token.
+        token = settings.METRICS_TOKEN
+        if not token or not constant_time_compare(
+                request.headers.get('Authorization', ''), f'Bearer {token}'):
+            raise Http404
+        return HttpResponse(metrics.render(),
+                            content_type='text/plain; version=0.0.4; charset=utf-8')